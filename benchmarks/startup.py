@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the wshot entry point
+
+Guards the lightweight CLI startup used by batch scripts and shell completions:
+  • imports `wshot.cli` under `python -X importtime` and fails if a heavy
+    module (Playwright, requests, json, the selector table...) is loaded
+  • fails if the cumulative import time of wshot.cli exceeds a budget
+  • reports the wall-clock time of `wshot --help`
+
+Usage:
+  python benchmarks/startup.py [--runs 10] [--budget-ms 60]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only load once a capture actually starts
+FORBIDDEN_MODULES = [
+    "playwright",
+    "requests",
+    "PIL",
+    "numpy",
+    "json",
+    "asyncio",
+    "sqlite3",
+    "tarfile",
+    "zipfile",
+    "http.server",
+    "wshot.api",
+    "wshot.help",
+    "wshot.filmstrip",
+    "wshot.assets",
+    "wshot.images",
+    "wshot.metrics",
+    "wshot.shard",
+    "wshot.sinks",
+    "wshot.profiling",
+    "wshot.scheduler",
+    "wshot.settle",
+    "wshot.similarity",
+    "wshot.core.capture",
+    "wshot.core.popups",
+    "wshot.core.opengraph",
+    "wshot.core.runner",
+    "wshot.core.utils",
+]
+
+
+def import_profile():
+    """Returns {module: cumulative microseconds} for a fresh `import wshot.cli`"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import wshot.cli"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <module>"
+        _, cumulative_us, module = line.split("|")
+        profile[module.strip()] = int(cumulative_us)
+    return profile
+
+
+def help_wall_time():
+    """Seconds taken by a complete `wshot --help` run, interpreter included"""
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import sys; sys.argv = ['wshot', '--help']; from wshot.cli import main; main()"],
+        cwd=REPO_ROOT, capture_output=True, check=True,
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="wshot startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Measurements per metric (default: 10)")
+    parser.add_argument("--budget-ms", type=float, default=60.0,
+                        help="Maximum median import time of wshot.cli in ms (default: 60)")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    leaked = sorted({module for profile in profiles for module in profile
+                     if any(module == name or module.startswith(name + ".") for name in FORBIDDEN_MODULES)})
+    import_ms = statistics.median(profile.get("wshot.cli", 0) for profile in profiles) / 1000
+    help_ms = statistics.median(help_wall_time() for _ in range(args.runs)) * 1000
+
+    print(f"import wshot.cli (median of {args.runs}): {import_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"wshot --help wall time (median of {args.runs}): {help_ms:.1f} ms")
+
+    failed = False
+    if leaked:
+        print(f"❌ Heavy modules imported at startup: {', '.join(leaked)}")
+        failed = True
+    if import_ms > args.budget_ms:
+        print("❌ Import time over budget")
+        failed = True
+    if not failed:
+        print("✅ Startup is lightweight")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+import tarfile
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+
+
+def test_archive_to_stdout_is_a_clean_tar_stream(tmp_path):
+    # Unresolvable URLs fail validation without a browser; the run manifest still goes into the stream
+    url_list = tmp_path / "urls.txt"
+    url_list.write_text("https://a.wshot-test.invalid\nhttps://b.wshot-test.invalid\n", encoding='utf-8')
+    process = subprocess.Popen(
+        [sys.executable, "-m", "wshot.cli", "--url-list", str(url_list), "--device", "desktop",
+         "--archive", "-", "--output-dir", str(tmp_path / "output"), "--no-catalog"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=REPOSITORY,
+    )
+    with tarfile.open(fileobj=process.stdout, mode='r|') as archive:
+        names = [member.name for member in archive]
+    _, errors = process.communicate(timeout=120)
+    errors = errors.decode('utf-8', errors='replace')
+
+    assert process.returncode == 0, errors
+    assert len(names) == 1 and names[0].startswith("manifests/manifest-")
+    # Progress went to stderr instead of corrupting the archive
+    assert "Screenshots completed" in errors
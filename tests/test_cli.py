@@ -0,0 +1,71 @@
+import datetime
+import importlib
+import pathlib
+import platform
+import re
+import subprocess
+import time
+import urllib.parse
+
+import pytest
+
+import wshot.cli
+
+# What `from wshot.cli import <name>` gave before the code moved out of the module
+MOVED = {
+    "display_extended_help": ("wshot.help", "display_extended_help"),
+    "validar_url": ("wshot.core.utils", "validar_url"),
+    "extraer_nombre_cliente": ("wshot.core.utils", "extraer_nombre_cliente"),
+    "generate_capture_filename": ("wshot.core.utils", "generate_capture_filename"),
+    "silent": ("wshot.core.utils", "silent"),
+    "prefixed_log": ("wshot.core.utils", "prefixed_log"),
+    "resolve_output_root": ("wshot.core.utils", "resolve_output_root"),
+    "create_device_folder_structure": ("wshot.core.utils", "create_device_folder_structure"),
+    "open_file_explorer": ("wshot.core.utils", "open_file_explorer"),
+    "POPUP_CLOSE_SELECTORS": ("wshot.core.popups", "POPUP_CLOSE_SELECTORS"),
+    "auto_dismiss_popups": ("wshot.core.popups", "auto_dismiss_popups"),
+    "OPENGRAPH_SCRIPT": ("wshot.core.opengraph", "OPENGRAPH_SCRIPT"),
+    "extract_opengraph_metadata": ("wshot.core.opengraph", "extract_opengraph_metadata"),
+    "save_opengraph_metadata": ("wshot.core.opengraph", "save_opengraph_metadata"),
+    "run_opengraph_extraction": ("wshot.core.opengraph", "run_opengraph_extraction"),
+    "wait_for_animations": ("wshot.core.capture", "wait_for_animations"),
+    "smooth_scroll_page": ("wshot.core.capture", "smooth_scroll_page"),
+    "capture_screenshot": ("wshot.core.capture", "capture_screenshot"),
+    "DEVICE_SIZES": ("wshot.core.devices", "DEVICE_SIZES"),
+}
+
+STANDARD_LIBRARY = {
+    "Path": pathlib.Path,
+    "datetime": datetime.datetime,
+    "urlparse": urllib.parse.urlparse,
+    "platform": platform,
+    "re": re,
+    "subprocess": subprocess,
+    "time": time,
+}
+
+
+@pytest.mark.parametrize("name", sorted(MOVED))
+def test_moved_names_are_the_moved_objects(name):
+    module_name, attribute = MOVED[name]
+    assert getattr(wshot.cli, name) is getattr(importlib.import_module(module_name), attribute)
+
+
+@pytest.mark.parametrize("name", sorted(STANDARD_LIBRARY))
+def test_standard_library_names_keep_their_old_meaning(name):
+    assert getattr(wshot.cli, name) is STANDARD_LIBRARY[name]
+
+
+def test_datetime_is_the_class():
+    from wshot.cli import datetime as old_datetime
+
+    assert isinstance(old_datetime.now(), datetime.datetime)
+
+
+def test_every_moved_name_is_covered():
+    assert set(wshot.cli._MOVED_NAMES) == set(MOVED) | set(STANDARD_LIBRARY)
+
+
+def test_unknown_name():
+    with pytest.raises(AttributeError):
+        wshot.cli.not_a_name
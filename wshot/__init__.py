@@ -9,6 +9,18 @@ __version__ = "1.0.0"
 __author__ = "Daniel Martinez Sebastian"
 __license__ = "MIT"
 
-from .cli import main
+__all__ = ["main", "capture", "capture_many"]
 
-__all__ = ["main"]
+# Resolved on first access (PEP 562): importing the package stays cheap for the
+# CLI entry point, and the async API only loads when it is actually used
+_LAZY_NAMES = {
+    "main": "wshot.cli",
+    "capture": "wshot.api",
+    "capture_many": "wshot.api",
+}
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
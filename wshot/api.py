@@ -0,0 +1,396 @@
+"""
+Async Python API for embedding wshot in other services
+
+Runs captures from asyncio code without spawning `wshot` subprocesses. Built on
+playwright.async_api, it reuses the CLI selectors, scripts and naming rules,
+and stays silent unless verbose=True.
+
+Example:
+    import asyncio
+    from wshot import capture
+
+    result = asyncio.run(capture("https://example.com", devices=["mobile", "desktop"]))
+    png = result["devices"]["mobile"]["fullpage"]["bytes"]
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from .core.capture import (
+    RETRYABLE_FAILURES,
+    SCROLL_STEP_SIZE,
+    SCROLL_STEP_SCRIPT,
+    SCROLL_STEP_PAUSE,
+    FORCE_ANIMATIONS_SCRIPT,
+    classify_failure,
+    phase_timeouts,
+    scroll_progress_message,
+)
+from .core.devices import DEVICE_SIZES, browser_context_options, expand_devices
+from .core.opengraph import OPENGRAPH_SCRIPT, save_opengraph_metadata
+from .core.popups import POPUP_CLOSE_SELECTORS
+from .core.utils import (
+    generate_capture_filename,
+    extraer_nombre_cliente,
+    create_device_folder_structure,
+    resolve_output_root,
+    silent,
+)
+from .sinks import DEFAULT_SINK
+
+
+def _run_blocking(function, *args):
+    """Runs blocking work (disk writes, requests) without stalling the event loop"""
+    return asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+def _resolve_devices(devices):
+    """Accepts a device key or group ('phones'...), a list of them or 'all'; defaults to desktop"""
+    if devices is None:
+        return ["desktop"]
+    if isinstance(devices, str):
+        devices = [devices]
+    return expand_devices(devices)
+
+
+@asynccontextmanager
+async def browser_session(browser=None):
+    """Yields the given browser, or launches (and later closes) a headless Chromium"""
+    if browser is not None:
+        yield browser
+        return
+
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        raise ImportError("wshot.api requires playwright: pip install playwright && playwright install chromium")
+
+    async with async_playwright() as p:
+        launched = await p.chromium.launch(headless=True)
+        try:
+            yield launched
+        finally:
+            await launched.close()
+
+
+async def navigate(page, url, timeouts, log=silent):
+    """
+    Async counterpart of core.capture.navigate: DOMContentLoaded and load
+    within the 'navigate' timeout, then network idle for at most 'settle'
+    more seconds. Returns (response, load state reached)
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    started = time.monotonic()
+    # Playwright reads a 0 ms timeout as "no timeout"
+    response = await page.goto(url, wait_until="domcontentloaded", timeout=max(1, timeouts["navigate"] * 1000))
+    load_state = "domcontentloaded"
+    try:
+        remaining = timeouts["navigate"] - (time.monotonic() - started)
+        await page.wait_for_load_state("load", timeout=max(1, remaining * 1000))
+        load_state = "load"
+        if timeouts["settle"] > 0:
+            await page.wait_for_load_state("networkidle", timeout=timeouts["settle"] * 1000)
+            load_state = "networkidle"
+    except PlaywrightTimeoutError:
+        waiting_for = "load" if load_state == "domcontentloaded" else "network idle"
+        log(f"⏱️  {waiting_for} not reached in time, continuing after '{load_state}'")
+    return response, load_state
+
+
+async def wait_for_animations(page, wait_time, log=silent):
+    """Waits the specified time for animations to load"""
+    if wait_time > 0:
+        log(f"⏳ Waiting {wait_time} seconds for animations to load...")
+        await asyncio.sleep(wait_time)
+
+
+async def auto_dismiss_popups(page, log=silent, timeout=None):
+    """Async counterpart of core.popups.auto_dismiss_popups, same selector list and timeout (seconds)"""
+    log("🔍 Detecting and closing pop-ups automatically...")
+
+    closed_popups_count = 0
+    deadline = time.monotonic() + timeout if timeout else None
+    for attempts, selector in enumerate(POPUP_CLOSE_SELECTORS):
+        if deadline is not None and time.monotonic() > deadline:
+            log(f"⏱️  Pop-up search stopped after {timeout:g}s ({attempts} of {len(POPUP_CLOSE_SELECTORS)} selectors tried)")
+            break
+        try:
+            popup_elements = page.locator(selector)
+            count = await popup_elements.count()
+
+            for i in range(count):
+                try:
+                    popup_element = popup_elements.nth(i)
+                    if await popup_element.is_visible(timeout=500):
+                        await popup_element.click(timeout=1000)
+                        closed_popups_count += 1
+                        log(f"✅ Pop-up cerrado: {selector}")
+                        await asyncio.sleep(0.5)
+                        break
+                except Exception:
+                    continue
+        except Exception:
+            pass
+
+    if closed_popups_count > 0:
+        log(f"✅ {closed_popups_count} pop-up(s) closed automatically")
+        await asyncio.sleep(1.0)
+    else:
+        log("ℹ️  No pop-ups detected to close (or already closed)")
+
+    return closed_popups_count
+
+
+async def smooth_scroll_page(page, log=silent, timeout=None):
+    """Async counterpart of core.capture.smooth_scroll_page, same scroll steps, scripts and timeout"""
+    log("📜 Performing smooth scroll to trigger animations...")
+
+    total_height = await page.evaluate("document.body.scrollHeight")
+    viewport_height = await page.evaluate("window.innerHeight")
+    log(f"📏 Total page height: {total_height}px, Viewport: {viewport_height}px")
+
+    steps = int(total_height / SCROLL_STEP_SIZE)
+    deadline = time.monotonic() + timeout if timeout else None
+    for i in range(steps):
+        if deadline is not None and time.monotonic() > deadline:
+            log(f"⏱️  Scroll stopped after {timeout:g}s at step {i} of {steps}")
+            break
+        await page.evaluate(SCROLL_STEP_SCRIPT)
+        await asyncio.sleep(SCROLL_STEP_PAUSE)
+        message = scroll_progress_message(i, steps, total_height)
+        if message:
+            log(message)
+
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    log("📍 Reached end of page")
+    await page.evaluate(FORCE_ANIMATIONS_SCRIPT)
+    await asyncio.sleep(1.0)
+    log("✅ Scroll completed - page ready for capture from the bottom")
+
+
+async def extract_opengraph_metadata(page, url, base_path=None, timestamp=None, log=silent, sink=None):
+    """
+    Extracts OpenGraph metadata from a loaded page.
+
+    With base_path the JSON and og:image are saved like the CLI does (in a
+    worker thread, through `sink`); without it the metadata is only returned.
+    """
+    log("🔍 Extracting OpenGraph metadata...")
+    og_data = await page.evaluate(OPENGRAPH_SCRIPT)
+
+    if base_path is None:
+        og_data['extracted_at'] = datetime.now().isoformat()
+        og_data['source_url'] = url
+        og_data['timestamp'] = timestamp
+        return og_data
+
+    return await _run_blocking(save_opengraph_metadata, og_data, url, base_path, timestamp, log, sink)
+
+
+async def capture_screenshot(browser, url, device_key, base_path=None, timestamp=None, wait_time=3.0,
+                             smooth_scroll=False, auto_dismiss=False, log=silent, sink=None, timeouts=None):
+    """
+    Captures the viewport and full page of a URL for one device.
+
+    timeouts: per-phase limits in seconds overriding PHASE_TIMEOUTS, as in
+    the CLI (--timeouts).
+
+    Returns:
+        dict: 'status' ('ok' or 'failed'), 'error', per-phase 'timings' in
+        seconds, 'http_status' and 'load_state', and 'viewport'/'fullpage'
+        entries holding the PNG 'bytes' and the 'path' where the sink stored
+        it (None when base_path is not given). A failure also has its 'phase',
+        'failure' category and whether it is 'retryable'
+    """
+    sink = sink or DEFAULT_SINK
+    device_config = DEVICE_SIZES[device_key]
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    result = {"device": device_key, "status": "failed", "viewport": None, "fullpage": None,
+              "error": None, "timings": {}}
+    timings = result["timings"]
+    timeouts = phase_timeouts(timeouts)
+    screenshot_timeout = max(1, timeouts["screenshot"] * 1000)
+    phase = "launch"
+    started = time.perf_counter()
+
+    async def store(data, es_completa):
+        path = None
+        if base_path is not None:
+            path = base_path / generate_capture_filename(url, device_key, timestamp, es_completa)
+            path = await _run_blocking(sink.write, path, data)
+        return {"bytes": data, "path": path}
+
+    log(f"📱 Configuring: {device_config['nombre']} ({device_config['width']}x{device_config['height']})")
+    page = await browser.new_page(**browser_context_options(device_config))
+    try:
+        phase = "navigate"
+        phase_start = time.perf_counter()
+        log(f"📸 Navigating to: {url}")
+        response, result["load_state"] = await navigate(page, url, timeouts, log)
+        timings["navigate"] = time.perf_counter() - phase_start
+        if response is not None:
+            result["http_status"] = response.status
+
+        phase = "settle"
+        phase_start = time.perf_counter()
+        await wait_for_animations(page, wait_time, log)
+        timings["wait"] = time.perf_counter() - phase_start
+
+        if auto_dismiss:
+            phase = "dismiss"
+            phase_start = time.perf_counter()
+            await auto_dismiss_popups(page, log, timeouts["dismiss"])
+            timings["dismiss"] = time.perf_counter() - phase_start
+
+        phase = "screenshot"
+        phase_start = time.perf_counter()
+        result["viewport"] = await store(await page.screenshot(timeout=screenshot_timeout), False)
+        timings["viewport"] = time.perf_counter() - phase_start
+
+        if smooth_scroll:
+            phase = "scroll"
+            phase_start = time.perf_counter()
+            await smooth_scroll_page(page, log, timeouts["scroll"])
+            await wait_for_animations(page, 1.0, log)
+            timings["scroll"] = time.perf_counter() - phase_start
+
+        phase = "screenshot"
+        phase_start = time.perf_counter()
+        result["fullpage"] = await store(await page.screenshot(full_page=True, timeout=screenshot_timeout), True)
+        timings["fullpage"] = time.perf_counter() - phase_start
+
+        result["status"] = "ok"
+    except Exception as e:
+        result["error"] = str(e)
+        result["phase"] = phase
+        result["failure"] = classify_failure(e, phase)
+        result["retryable"] = result["failure"] in RETRYABLE_FAILURES or result["failure"].endswith("-timeout")
+        log(f"❌ Error capturing {url} on {device_key} ({result['failure']}): {e}")
+    finally:
+        await page.close()
+        timings["total"] = time.perf_counter() - started
+
+    return result
+
+
+async def capture(url, devices=None, wait_time=3.0, smooth_scroll=False, auto_dismiss=False,
+                  open_graph=False, save=True, output_dir=None, client=None, timestamp=None,
+                  concurrency=4, browser=None, verbose=False, sink=None, timeouts=None):
+    """
+    Captures a URL on several devices and returns paths, bytes and timings.
+
+    Args:
+        url: Complete URL (with http:// or https://)
+        devices: Device key or group ('phones', 'tablets'...), a list of them or 'all' (default: desktop)
+        wait_time, smooth_scroll, auto_dismiss, open_graph: Same as the CLI options
+        save: Write files to the usual client/device layout (False keeps them in memory only)
+        sink: Output sink (wshot.sinks) receiving every file instead of the disk,
+            ex: MemorySink(), CallbackSink(upload) or ZipSink("run.zip")
+        output_dir: Custom output directory (default: ~/Pictures/WSHOT/)
+        client: Client folder name (default: detected from the URL)
+        timestamp: Timestamp used in filenames (default: now)
+        concurrency: Maximum devices captured at the same time
+        browser: Existing playwright.async_api Browser to reuse
+        verbose: Print progress like the CLI does
+        timeouts: Per-phase limits in seconds, ex: {"navigate": 20, "settle": 5} (see PHASE_TIMEOUTS;
+            ValueError for an unknown phase or a limit <= 0, only settle may be 0)
+
+    Returns:
+        dict: 'url', 'client', 'timestamp', 'base_path', 'opengraph' and
+        'devices' mapping each device key to its capture_screenshot() result
+    """
+    log = print if verbose else silent
+    device_keys = _resolve_devices(devices)
+    timeouts = phase_timeouts(timeouts)
+    client_name = client or extraer_nombre_cliente(url)
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    if sink is None and save:
+        sink = DEFAULT_SINK
+    base_path = None
+    if sink is not None:
+        if sink.root is None and sink is not DEFAULT_SINK:
+            # Name archive/memory entries client/device/file, like the folder layout
+            sink.root = resolve_output_root(output_dir)
+        base_path = await _run_blocking(create_device_folder_structure, client_name, device_keys,
+                                        output_dir, log, sink)
+
+    result = {"url": url, "client": client_name, "timestamp": timestamp,
+              "base_path": str(base_path) if base_path else None, "opengraph": None, "devices": {}}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async with browser_session(browser) as active_browser:
+
+        async def run_device(device_key):
+            async with semaphore:
+                device_path = base_path / device_key if base_path else None
+                return await capture_screenshot(active_browser, url, device_key, device_path, timestamp,
+                                                wait_time, smooth_scroll, auto_dismiss, log, sink, timeouts)
+
+        async def run_opengraph():
+            async with semaphore:
+                page = await active_browser.new_page(viewport={"width": DEVICE_SIZES['desktop']['width'],
+                                                               "height": DEVICE_SIZES['desktop']['height']})
+                phase = "navigate"
+                try:
+                    await navigate(page, url, timeouts, log)
+                    await asyncio.sleep(2)
+                    if auto_dismiss:
+                        phase = "dismiss"
+                        await auto_dismiss_popups(page, log, timeouts["dismiss"])
+                    phase = "opengraph"
+                    return await extract_opengraph_metadata(page, url, base_path, timestamp, log, sink)
+                except Exception as e:
+                    log(f"❌ Error extracting OpenGraph ({classify_failure(e, phase)}): {e}")
+                    return None
+                finally:
+                    await page.close()
+
+        jobs = [run_device(device_key) for device_key in device_keys]
+        if open_graph:
+            jobs.append(run_opengraph())
+        outcomes = await asyncio.gather(*jobs)
+
+    if open_graph:
+        result["opengraph"] = outcomes.pop()
+    for device_key, device_result in zip(device_keys, outcomes):
+        result["devices"][device_key] = device_result
+
+    return result
+
+
+async def capture_many(urls, devices=None, concurrency=2, browser=None, **options):
+    """
+    Async generator capturing a batch of URLs with one shared browser.
+
+    Yields each capture() result as soon as its URL finishes (not in input
+    order). At most `concurrency` URLs are in flight, so large or lazy URL
+    iterables are consumed progressively. Other keyword arguments are passed
+    to capture().
+    """
+    async with browser_session(browser) as active_browser:
+        url_iterator = iter(urls)
+        pending = set()
+
+        def start_next():
+            for next_url in url_iterator:
+                pending.add(asyncio.ensure_future(
+                    capture(next_url, devices=devices, browser=active_browser, **options)))
+                return
+
+        for _ in range(max(1, concurrency)):
+            start_next()
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    start_next()
+                    yield finished.result()
+        finally:
+            # The consumer stopped early: don't leave captures running on a closing browser
+            for unfinished in pending:
+                unfinished.cancel()
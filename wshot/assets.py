@@ -0,0 +1,328 @@
+"""
+Asset harvesting: the images, videos and audio files a page uses
+
+With --assets the page loaded for OpenGraph (once per URL) is also searched
+for media: <img> and srcset candidates, <picture>/<video>/<audio> sources,
+posters, icons, og:image/og:video, inline background images, plus every
+image or media response seen while the page loaded. The files are downloaded
+in background threads (one keep-alive HTTP session each), with the same per-host
+limits as the captures (--per-host, --host-rps), and written as:
+
+    <client>/assets/<sha256 prefix>.<ext>
+    <client>/assets/assets-<timestamp>.json    # page URL of every file, type, size, sha256
+
+The type comes from the first bytes of the file (not from the URL), the same
+content is only written once per run, and downloads stop when the run reaches
+--assets-max-mb.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+
+from .scheduler import RETRYABLE_STATUSES, HostLimiter, host_of, parse_retry_after
+
+ASSETS_FOLDER = "assets"
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_MB = 200
+# Pages with thousands of sprites or tracking pixels are cut here
+MAX_ASSETS_PER_PAGE = 500
+CHUNK_SIZE = 64 * 1024
+# Enough for every signature below, SVG included (XML prolog, comments)
+SNIFF_BYTES = 512
+# Downloads are kept in memory up to this size, then spooled to a temporary file
+SPOOL_BYTES = 4 * 1024 * 1024
+# (connect, read) seconds
+DOWNLOAD_TIMEOUT = (10, 30)
+# Hosts whose connections each download thread keeps alive
+POOL_HOSTS = 16
+# Playwright resource types kept from the network log
+NETWORK_RESOURCE_TYPES = ("image", "media")
+
+# Media URLs of the loaded page, resolved against the document base URL
+MEDIA_SCRIPT = """
+    () => {
+        const found = [];
+        const add = url => { if (url) found.push(url); };
+        // Largest candidate of a srcset (w or x descriptor)
+        const largest = srcset => {
+            let best = null, bestSize = -1;
+            for (const candidate of srcset.split(/,\\s+/)) {
+                const [url, descriptor] = candidate.trim().split(/\\s+/);
+                const size = descriptor ? parseFloat(descriptor) : 1;
+                if (url && size > bestSize) { best = url; bestSize = size; }
+            }
+            return best;
+        };
+
+        document.querySelectorAll('img').forEach(img => {
+            add(img.currentSrc || img.src);
+            if (img.srcset) add(largest(img.srcset));
+        });
+        document.querySelectorAll('picture source[srcset]').forEach(source => add(largest(source.srcset)));
+        document.querySelectorAll('video, audio').forEach(media => {
+            add(media.currentSrc || media.src);
+            if (media.poster) add(media.poster);
+        });
+        document.querySelectorAll('video source[src], audio source[src]').forEach(source => add(source.src));
+        document.querySelectorAll('meta[property="og:image"], meta[property="og:image:url"], meta[property="og:video"], meta[name="twitter:image"]')
+            .forEach(meta => add(meta.getAttribute('content')));
+        document.querySelectorAll('link[rel~="icon"], link[rel="apple-touch-icon"]').forEach(link => add(link.href));
+        // Inline styles only: computed styles of every element would force a full style recalculation
+        document.querySelectorAll('[style*="url("]').forEach(element => {
+            for (const match of element.style.backgroundImage.matchAll(/url\\(["']?([^"')]+)["']?\\)/g)) add(match[1]);
+        });
+
+        return found.map(url => {
+            try {
+                return new URL(url, document.baseURI).href;
+            } catch (e) {
+                return null;
+            }
+        }).filter(Boolean);
+    }
+"""
+
+
+def sniff_type(head):
+    """
+    (extension, kind) of a file from its first bytes, kind being image, video
+    or audio. (None, None) when it is not a known media format (ex: an HTML
+    error page served with a 200)
+    """
+    head = bytes(head[:SNIFF_BYTES])
+    if head.startswith(b'\xff\xd8\xff'):
+        return "jpg", "image"
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return "png", "image"
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return "gif", "image"
+    if head.startswith(b'RIFF') and len(head) >= 12:
+        form = head[8:12]
+        if form == b'WEBP':
+            return "webp", "image"
+        if form == b'WAVE':
+            return "wav", "audio"
+        if form == b'AVI ':
+            return "avi", "video"
+    if head[4:8] == b'ftyp':
+        brand = head[8:12]
+        if brand in (b'avif', b'avis'):
+            return "avif", "image"
+        if brand in (b'heic', b'heix', b'mif1', b'msf1'):
+            return "heic", "image"
+        if brand in (b'M4A ', b'M4B '):
+            return "m4a", "audio"
+        if brand == b'qt  ':
+            return "mov", "video"
+        return "mp4", "video"
+    if head.startswith(b'\x1a\x45\xdf\xa3'):
+        return ("webm" if b'webm' in head else "mkv"), "video"
+    if head.startswith(b'OggS'):
+        return "ogg", "audio"
+    if head.startswith(b'fLaC'):
+        return "flac", "audio"
+    if head.startswith(b'ID3') or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3", "audio"
+    if head.startswith(b'\x00\x00\x01\x00'):
+        return "ico", "image"
+    if head.startswith(b'BM') and len(head) >= 14:
+        return "bmp", "image"
+    text = head.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if text.startswith(b'<svg') or (text.startswith((b'<?xml', b'<!--', b'<!doctype svg')) and b'<svg' in text):
+        return "svg", "image"
+    return None, None
+
+
+def pooled_session(hosts=POOL_HOSTS):
+    """requests session for one download thread, keeping connections to up to `hosts` hosts alive"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=hosts, pool_maxsize=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def media_urls(urls, skip=(), limit=MAX_ASSETS_PER_PAGE):
+    """http(s) URLs of a list, in order, without repeats, fragments or anything in skip"""
+    selected = []
+    seen = set(skip)
+    for url in urls:
+        url = url.split('#', 1)[0]
+        if not url.startswith(("http://", "https://")) or url in seen:
+            continue
+        seen.add(url)
+        selected.append(url)
+        if len(selected) == limit:
+            break
+    return selected
+
+
+class AssetHarvester:
+    """
+    Downloads the media of harvested pages in background threads and writes
+    them through the sink. close() waits for every download and writes one
+    index per page.
+    """
+
+    def __init__(self, sink=None, workers=DEFAULT_WORKERS, max_bytes=DEFAULT_MAX_MB * 1024 * 1024,
+                 max_per_host=4, requests_per_second=0.0, log=print):
+        from concurrent.futures import ThreadPoolExecutor
+        from .sinks import DEFAULT_SINK
+
+        self.sink = sink or DEFAULT_SINK
+        self.max_bytes = max_bytes
+        self.log = log
+        # requests.Session isn't documented as thread-safe: one per download thread
+        self._local = threading.local()
+        self._sessions = []
+        # Its own limiter: capture workers keep their host slot while the page is harvested
+        self.hosts = HostLimiter(max_per_host, requests_per_second)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wshot-assets")
+        self._lock = threading.Lock()
+        # sha256 -> location of the first copy written in this run (None while it is being written)
+        self._written = {}
+        self._bytes = 0
+        self._pages = []
+
+    def harvest(self, page, url, base_path, timestamp, network_urls=(), skip=()):
+        """Collects the media URLs of a loaded page and queues their download. Returns how many"""
+        urls = media_urls(list(page.evaluate(MEDIA_SCRIPT)) + list(network_urls), skip)
+        self.submit(url, urls, base_path, timestamp)
+        self.log(f"🧲 {len(urls)} media file(s) found, downloading in the background")
+        return len(urls)
+
+    def submit(self, page_url, asset_urls, base_path, timestamp):
+        """Queues the download of asset_urls into <base_path>/assets/"""
+        folder = Path(base_path) / ASSETS_FOLDER
+        jobs = [(asset_url, self._executor.submit(self._fetch, asset_url, folder)) for asset_url in asset_urls]
+        with self._lock:
+            self._pages.append((page_url, folder, timestamp, jobs))
+
+    def _session(self):
+        """HTTP session of the current download thread"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = pooled_session()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _fetch(self, url, folder, attempts=2):
+        """Downloads one asset. Returns its index entry"""
+        import tempfile
+
+        entry = {"url": url}
+        host = host_of(url)
+        for attempt in range(attempts):
+            with self._lock:
+                remaining = self.max_bytes - self._bytes
+            if remaining <= 0:
+                return dict(entry, status="skipped", reason="size cap")
+            try:
+                with self.hosts.slot(host):
+                    response = self._session().get(url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+                    try:
+                        if response.status_code in RETRYABLE_STATUSES and attempt + 1 < attempts:
+                            self.hosts.backoff(host, parse_retry_after(response.headers.get("Retry-After")))
+                            continue
+                        if response.status_code != 200:
+                            return dict(entry, status="failed", reason=f"HTTP {response.status_code}")
+                        length = response.headers.get("Content-Length")
+                        if length and length.isdigit() and int(length) > remaining:
+                            return dict(entry, status="skipped", reason="size cap")
+
+                        # Closed on every way out (size cap, errors, retries), even once spooled to disk
+                        with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as buffer:
+                            digest = hashlib.sha256()
+                            head = b''
+                            size = 0
+                            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                                if len(head) < SNIFF_BYTES:
+                                    head += chunk[:SNIFF_BYTES - len(head)]
+                                    # Stop reading as soon as it is clearly not media
+                                    if len(head) == SNIFF_BYTES and sniff_type(head)[0] is None:
+                                        break
+                                size += len(chunk)
+                                if size > remaining:
+                                    return dict(entry, status="skipped", reason="size cap")
+                                digest.update(chunk)
+                                buffer.write(chunk)
+                            self.hosts.success(host)
+                            return self._store(entry, folder, buffer, head, size, digest.hexdigest())
+                    finally:
+                        response.close()
+            except Exception as e:
+                return dict(entry, status="failed", reason=str(e))
+        return dict(entry, status="failed", reason="rate limited")
+
+    def _store(self, entry, folder, buffer, head, size, sha256):
+        """Writes a downloaded file once per run (by content). Returns its index entry"""
+        extension, kind = sniff_type(head)
+        if extension is None:
+            return dict(entry, status="skipped", reason="not a media file")
+        entry = dict(entry, type=extension, kind=kind, bytes=size, sha256=sha256)
+        with self._lock:
+            if sha256 in self._written:
+                # Its location is filled in by close(), the first copy may still be writing
+                return dict(entry, status="duplicate")
+            if self._bytes + size > self.max_bytes:
+                return dict(entry, status="skipped", reason="size cap")
+            self._bytes += size
+            self._written[sha256] = None
+        buffer.seek(0)
+        try:
+            location = self.sink.write_stream(folder / f"{sha256[:16]}.{extension}",
+                                              iter(lambda: buffer.read(CHUNK_SIZE), b''))
+        except Exception:
+            # Another page may still have the same file: let it try
+            with self._lock:
+                del self._written[sha256]
+                self._bytes -= size
+            raise
+        with self._lock:
+            self._written[sha256] = location
+        return dict(entry, status="ok", file=location)
+
+    def close(self):
+        """
+        Waits for every download, writes the index of each page and returns
+        their summaries [{'url', 'index', 'files', 'duplicates', 'skipped',
+        'failed', 'bytes'}]
+        """
+        import json
+
+        self._executor.shutdown(wait=True)
+        for session in self._sessions:
+            session.close()
+        summaries = []
+        for page_url, folder, timestamp, jobs in self._pages:
+            entries = []
+            for asset_url, job in jobs:
+                try:
+                    entry = job.result()
+                except Exception as e:
+                    entry = {"url": asset_url, "status": "failed", "reason": str(e)}
+                if entry["status"] == "duplicate":
+                    entry["file"] = self._written.get(entry["sha256"])
+                entries.append(entry)
+            counts = {status: sum(1 for entry in entries if entry["status"] == status)
+                      for status in ("ok", "duplicate", "skipped", "failed")}
+            summary = {
+                "url": page_url,
+                "files": counts["ok"],
+                "duplicates": counts["duplicate"],
+                "skipped": counts["skipped"],
+                "failed": counts["failed"],
+                "bytes": sum(entry.get("bytes", 0) for entry in entries if entry["status"] == "ok"),
+            }
+            index = dict(summary, timestamp=timestamp, assets=entries)
+            summary["index"] = self.sink.write(folder / f"assets-{timestamp}.json",
+                                               json.dumps(index, indent=2, ensure_ascii=False).encode('utf-8'))
+            self.log(f"🧲 {page_url}: {summary['files']} asset(s), {summary['bytes'] / 1048576:.1f} MB "
+                     f"({summary['duplicates']} duplicate(s), {summary['skipped']} skipped, {summary['failed']} failed)")
+            summaries.append(summary)
+        return summaries
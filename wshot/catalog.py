@@ -0,0 +1,410 @@
+"""
+Capture catalog: SQLite index of every screenshot across runs
+
+Finding "the last mobile full-page shot of example.com/contact" should not
+mean walking ~/Pictures/WSHOT/<client>/<device>/ and parsing filenames. Runs
+record each capture in <output-dir>/catalog.sqlite3 as it is written, and
+`wshot reindex` rebuilds the catalog from an existing folder tree.
+
+Queries:
+  wshot query example.com/contact --device mobile --type fullpage --last
+  wshot query example.com --since 20250101 --json
+  wshot similar example.com --type fullpage
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+CATALOG_FILENAME = "catalog.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    url TEXT,
+    host TEXT,
+    page TEXT,
+    client TEXT,
+    device TEXT,
+    viewport_width INTEGER,
+    viewport_height INTEGER,
+    capture_type TEXT,
+    timestamp TEXT,
+    captured_at TEXT,
+    width INTEGER,
+    height INTEGER,
+    size INTEGER,
+    mtime REAL,
+    sha256 TEXT,
+    phash TEXT,
+    selector TEXT,
+    timings TEXT,
+    run_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_captures_page ON captures (host, page, device, capture_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_captures_client ON captures (client, timestamp);
+CREATE TABLE IF NOT EXISTS opengraph (
+    url TEXT NOT NULL,
+    host TEXT,
+    page TEXT,
+    client TEXT,
+    timestamp TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    image TEXT,
+    site_name TEXT,
+    type TEXT,
+    path TEXT,
+    PRIMARY KEY (url, timestamp)
+);
+CREATE TABLE IF NOT EXISTS settle_times (
+    host TEXT NOT NULL,
+    device TEXT,
+    seconds REAL NOT NULL,
+    censored INTEGER NOT NULL DEFAULT 0,
+    recorded_at TEXT NOT NULL,
+    run_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_settle_times_host ON settle_times (host, recorded_at);
+"""
+
+# Settle samples kept per host (--wait-time auto only reads the newest ones)
+SETTLE_HISTORY_LIMIT = 200
+
+# Columns added after the first catalog version: (name, type)
+ADDED_COLUMNS = [
+    ("phash", "TEXT"),
+    ("selector", "TEXT"),
+]
+
+# <name base>-<device>[-fullpage|-element-<selector slug>]-<YYYYMMDD_HHMMSS>.png, the device comes from the folder
+TIMESTAMP_PATTERN = r"(?P<timestamp>\d{8}_\d{6})"
+
+
+def default_catalog_path(output_root):
+    return Path(output_root).expanduser() / CATALOG_FILENAME
+
+
+def page_key(url_or_page):
+    """
+    Splits a URL (or 'example.com/contact') into the (host, page) pair used by
+    capture filenames, ex: ('example.com', 'contact')
+    """
+    from .core.utils import capture_name_base
+
+    if '://' not in url_or_page:
+        url_or_page = f"https://{url_or_page}"
+    host, page = capture_name_base(url_or_page).split('_', 1)
+    return host, page
+
+
+def parse_capture_filename(filename, device):
+    """Parses a capture filename of a known device folder, None if it doesn't match"""
+    match = re.match(
+        rf"^(?P<base>[a-zA-Z0-9.]+_[a-zA-Z0-9\-]+?|capture)-{re.escape(device)}"
+        rf"(?:(?P<full>-fullpage)|-element-(?P<element>[a-zA-Z0-9\-]+))?-{TIMESTAMP_PATTERN}\.png$",
+        filename)
+    if not match:
+        return None
+    base = match.group("base")
+    host, page = base.split('_', 1) if '_' in base else (None, None)
+    if match.group("element"):
+        capture_type = "element"
+    else:
+        capture_type = "fullpage" if match.group("full") else "viewport"
+    return {
+        "host": host,
+        "page": page,
+        "capture_type": capture_type,
+        "timestamp": match.group("timestamp"),
+        # Only the slug survives in the filename
+        "selector": match.group("element"),
+    }
+
+
+def _png_dimensions(path):
+    """Reads width and height from the PNG header (24 bytes, no decoding)"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(24)
+    except OSError:
+        return None, None
+    if header[:8] != b'\x89PNG\r\n\x1a\n' or len(header) < 24:
+        return None, None
+    return int.from_bytes(header[16:20], 'big'), int.from_bytes(header[20:24], 'big')
+
+
+class Catalog:
+    """SQLite catalog shared by the worker threads of a run"""
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        # WAL lets `wshot query` read while a run is writing
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Adds the columns a catalog written by an older version lacks"""
+        existing = {row["name"] for row in self._connection.execute("PRAGMA table_info(captures)")}
+        for name, column_type in ADDED_COLUMNS:
+            if name not in existing:
+                self._connection.execute(f"ALTER TABLE captures ADD COLUMN {name} {column_type}")
+        self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _upsert_capture(self, row):
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{column}" for column in row)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in row if column != "path")
+        self._connection.execute(
+            f"INSERT INTO captures ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT(path) DO UPDATE SET {updates}", row)
+
+    def record_capture(self, url, client, device_key, device_config, timestamp, result, run_id=None):
+        """Records the viewport, full page and element files of a capture_screenshot() result"""
+        host, page = page_key(url)
+        captured_at = datetime.now().isoformat()
+        timings = json.dumps(result.get("timings") or {})
+        files = [(capture_type, result.get(capture_type), result.get("files", {}).get(capture_type, {}))
+                 for capture_type in ("viewport", "fullpage")]
+        files += [("element", element["path"], element) for element in result.get("elements") or []]
+        with self._lock:
+            for capture_type, location, info in files:
+                if not location:
+                    continue
+                self._upsert_capture({
+                    "path": location,
+                    "url": url,
+                    "host": host,
+                    "page": page,
+                    "client": client,
+                    "device": device_key,
+                    "viewport_width": device_config.get("width"),
+                    "viewport_height": device_config.get("height"),
+                    "capture_type": capture_type,
+                    "timestamp": timestamp,
+                    "captured_at": captured_at,
+                    "width": info.get("width"),
+                    "height": info.get("height"),
+                    "size": info.get("size"),
+                    "mtime": None,
+                    "sha256": info.get("sha256"),
+                    "phash": info.get("phash"),
+                    "selector": info.get("selector"),
+                    "timings": timings,
+                    "run_id": run_id,
+                })
+            self._connection.commit()
+
+    def record_opengraph(self, url, client, timestamp, og_data, path=None):
+        """Records the OpenGraph summary of a URL for one run"""
+        host, page = page_key(url)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO opengraph "
+                "(url, host, page, client, timestamp, title, description, image, site_name, type, path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, host, page, client, timestamp, og_data.get("title"), og_data.get("description"),
+                 og_data.get("image"), og_data.get("site_name"), og_data.get("type"), path))
+            self._connection.commit()
+
+    def rebuild(self, output_root, compute_hash=False, compute_phash=False, log=print):
+        """
+        Indexes an existing output tree (<root>/<client>/<device>/*.png and
+        <root>/<client>/opengraph/*.json). Files already indexed with the same
+        size and mtime (and the requested hashes) are skipped, so running it
+        again is cheap.
+        """
+        import hashlib
+        from .core.devices import DEVICE_SIZES
+        from .similarity import perceptual_hash
+
+        output_root = Path(output_root).expanduser()
+        with self._lock:
+            known = {row["path"]: row for row in self._connection.execute(
+                "SELECT path, size, mtime, sha256, phash FROM captures")}
+
+        def up_to_date(path, stat):
+            row = known.get(path)
+            return (row is not None and (row["size"], row["mtime"]) == (stat.st_size, stat.st_mtime)
+                    and (row["sha256"] or not compute_hash) and (row["phash"] or not compute_phash))
+
+        indexed = skipped = 0
+        for client_dir in sorted(p for p in output_root.iterdir() if p.is_dir()):
+            client = client_dir.name
+            for device_dir in sorted(p for p in client_dir.iterdir() if p.is_dir()):
+                device_key = device_dir.name
+                if device_key == "opengraph":
+                    self._rebuild_opengraph(device_dir, client)
+                    continue
+                device_config = DEVICE_SIZES.get(device_key, {})
+                with os.scandir(device_dir) as entries:
+                    for entry in entries:
+                        if not entry.is_file() or not entry.name.endswith('.png'):
+                            continue
+                        parsed = parse_capture_filename(entry.name, device_key)
+                        if parsed is None:
+                            continue
+                        stat = entry.stat()
+                        if up_to_date(entry.path, stat):
+                            skipped += 1
+                            continue
+                        width, height = _png_dimensions(entry.path)
+                        sha256 = None
+                        if compute_hash:
+                            digest = hashlib.sha256()
+                            with open(entry.path, 'rb') as f:
+                                for chunk in iter(lambda: f.read(1 << 20), b''):
+                                    digest.update(chunk)
+                            sha256 = digest.hexdigest()
+                        phash = None
+                        if compute_phash:
+                            with open(entry.path, 'rb') as f:
+                                phash = perceptual_hash(f.read())
+                        # Rows recorded by a run have no mtime yet: keep the hashes it computed
+                        previous = known.get(entry.path)
+                        if previous is not None and previous["size"] == stat.st_size:
+                            sha256 = sha256 or previous["sha256"]
+                            phash = phash or previous["phash"]
+                        with self._lock:
+                            self._upsert_capture({
+                                "path": entry.path,
+                                "host": parsed["host"],
+                                "page": parsed["page"],
+                                "client": client,
+                                "device": device_key,
+                                "viewport_width": device_config.get("width"),
+                                "viewport_height": device_config.get("height"),
+                                "capture_type": parsed["capture_type"],
+                                "timestamp": parsed["timestamp"],
+                                "width": width,
+                                "height": height,
+                                "size": stat.st_size,
+                                "mtime": stat.st_mtime,
+                                "sha256": sha256,
+                                "phash": phash,
+                                "selector": parsed["selector"],
+                            })
+                        indexed += 1
+                        if indexed % 1000 == 0:
+                            log(f"   📇 {indexed} files indexed...")
+                            with self._lock:
+                                self._connection.commit()
+
+        with self._lock:
+            # Filenames lose the original URL: take it from the OpenGraph JSON of the same run
+            self._connection.execute(
+                "UPDATE captures SET url = (SELECT og.url FROM opengraph og "
+                "WHERE og.client = captures.client AND og.timestamp = captures.timestamp "
+                "AND og.host = captures.host AND og.page = captures.page) WHERE url IS NULL")
+            self._connection.commit()
+        return indexed, skipped
+
+    def _rebuild_opengraph(self, opengraph_dir, client):
+        for json_path in sorted(opengraph_dir.glob("opengraph-*.json")):
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    og_data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            url = og_data.get("source_url")
+            timestamp = og_data.get("timestamp")
+            if url and timestamp:
+                self.record_opengraph(url, client, timestamp, og_data, str(json_path))
+
+    def previous_capture(self, url, device, capture_type="fullpage"):
+        """Most recent capture of a page and device that has a perceptual hash, or None"""
+        host, page = page_key(url)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM captures WHERE host = ? AND page = ? AND device = ? AND capture_type = ? "
+                "AND phash IS NOT NULL ORDER BY timestamp DESC LIMIT 1",
+                (host, page, device, capture_type)).fetchone()
+        return dict(row) if row else None
+
+    def record_settle(self, url, device, settle, run_id=None):
+        """Records how long a page of the URL's host took to settle (a wshot.settle.measure_settle() dict)"""
+        host, _ = page_key(url)
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO settle_times (host, device, seconds, censored, recorded_at, run_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (host, device, settle["seconds"], int(settle["censored"]), datetime.now().isoformat(), run_id))
+            self._connection.execute(
+                "DELETE FROM settle_times WHERE host = ? AND rowid NOT IN "
+                "(SELECT rowid FROM settle_times WHERE host = ? ORDER BY recorded_at DESC LIMIT ?)",
+                (host, host, SETTLE_HISTORY_LIMIT))
+            self._connection.commit()
+
+    def settle_history(self, url, limit=50):
+        """Newest settle samples of the URL's host: [(seconds, censored, recorded_at)]"""
+        host, _ = page_key(url)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT seconds, censored, recorded_at FROM settle_times WHERE host = ? "
+                "ORDER BY recorded_at DESC LIMIT ?", (host, limit)).fetchall()
+        return [(row["seconds"], bool(row["censored"]), row["recorded_at"]) for row in rows]
+
+    def query(self, target=None, device=None, capture_type=None, client=None, since=None, until=None,
+              limit=50):
+        """
+        Searches captures, newest first.
+
+        target: 'example.com', 'example.com/contact' or a full URL. A bare host
+        matches every page of the site. A negative limit returns every match.
+        """
+        conditions, params = [], []
+        if target:
+            host, page = page_key(target)
+            conditions.append("c.host = ?")
+            params.append(host)
+            has_path = bool(urlparse(target if '://' in target else f"https://{target}").path.strip('/'))
+            if has_path:
+                conditions.append("c.page = ?")
+                params.append(page)
+        if device:
+            conditions.append("c.device = ?")
+            params.append(device)
+        if capture_type:
+            conditions.append("c.capture_type = ?")
+            params.append(capture_type)
+        if client:
+            conditions.append("c.client = ?")
+            params.append(client)
+        if since:
+            conditions.append("c.timestamp >= ?")
+            params.append(since)
+        if until:
+            conditions.append("c.timestamp <= ?")
+            # A bare date includes the whole day
+            params.append(until if '_' in until else f"{until}_235959")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (f"SELECT c.*, og.title AS og_title, og.description AS og_description, og.image AS og_image "
+               f"FROM captures c LEFT JOIN opengraph og "
+               f"ON og.client = c.client AND og.timestamp = c.timestamp AND og.host = c.host AND og.page = c.page "
+               f"{where} ORDER BY c.timestamp DESC, c.device, c.capture_type LIMIT ?")
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._connection.execute(sql, params)]
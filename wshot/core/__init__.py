@@ -0,0 +1,6 @@
+"""
+Wshot core - capture logic used by the CLI and the Python API
+
+Kept out of wshot.cli so that `wshot --help` and argument errors never pay for
+it: these modules are imported only once a capture actually starts.
+"""
@@ -0,0 +1,476 @@
+"""
+Screenshot capture: navigation, waits, smooth scroll and viewport/full page shots
+"""
+
+import time
+
+from ..scheduler import RETRYABLE_STATUSES, parse_retry_after
+from ..settle import measure_settle, page_clock
+from ..similarity import DEFAULT_MAX_DISTANCE, hamming_distance
+from ..sinks import DEFAULT_SINK
+from .devices import browser_context_options
+from .utils import generate_capture_filename, generate_element_filename, image_info
+
+# Default time limits per phase, in seconds (--timeouts navigate=20,screenshot=60)
+PHASE_TIMEOUTS = {
+    "navigate": 30.0,    # until DOMContentLoaded and load
+    "settle": 10.0,      # extra wait for network idle, then go on with what has loaded
+    "dismiss": 15.0,     # pop-up search
+    "scroll": 60.0,      # smooth scroll
+    "screenshot": 30.0,  # each screenshot
+}
+
+# Failures another attempt can fix (flaky network, crashed browser), besides timeouts
+RETRYABLE_FAILURES = ("connection", "browser-crash")
+# Failures of the site itself: the other devices of the URL are skipped
+PERMANENT_FAILURES = ("dns", "tls")
+
+def check_timeout(phase, seconds):
+    """Raises ValueError for an unknown phase or a limit that can't work (only settle may be 0)"""
+    if phase not in PHASE_TIMEOUTS:
+        raise ValueError(f"unknown phase {phase!r}, use one of {', '.join(PHASE_TIMEOUTS)}")
+    if not (seconds > 0 or (seconds == 0 and phase == "settle")):
+        raise ValueError(f"{phase} needs a positive number of seconds (only settle=0 is allowed, it skips network idle)")
+
+def phase_timeouts(overrides=None):
+    """PHASE_TIMEOUTS with the given {phase: seconds} applied, checked"""
+    for phase, seconds in (overrides or {}).items():
+        check_timeout(phase, seconds)
+    return dict(PHASE_TIMEOUTS, **(overrides or {}))
+
+def parse_timeouts(value):
+    """argparse type for --timeouts: 'navigate=20,screenshot=60' -> {phase: seconds}"""
+    import argparse
+    
+    timeouts = {}
+    for item in value.split(','):
+        phase, _, seconds = item.partition('=')
+        phase = phase.strip()
+        try:
+            timeouts[phase] = float(seconds)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"invalid timeout {item!r}: use PHASE=SECONDS with phase in {', '.join(PHASE_TIMEOUTS)}")
+        try:
+            check_timeout(phase, timeouts[phase])
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(f"invalid timeout {item!r}: {e}")
+    return timeouts
+
+def classify_failure(error, phase):
+    """
+    Failure category of a capture error, for the run report:
+    dns, tls, connection, browser-crash, <phase>-timeout or <phase>-error
+    """
+    message = str(error)
+    if "ERR_NAME_NOT_RESOLVED" in message or "ERR_NAME_RESOLUTION_FAILED" in message:
+        return "dns"
+    if "ERR_CERT" in message or "ERR_SSL" in message:
+        return "tls"
+    if any(code in message for code in ("ERR_CONNECTION", "ERR_ADDRESS_UNREACHABLE", "ERR_TIMED_OUT",
+                                        "ERR_EMPTY_RESPONSE", "ERR_NETWORK_CHANGED", "ERR_INTERNET_DISCONNECTED")):
+        return "connection"
+    if "crash" in message.lower() or "Target closed" in message or "has been closed" in message:
+        return "browser-crash"
+    if "Timeout" in type(error).__name__ or "Timeout" in message:
+        return f"{phase}-timeout"
+    return f"{phase}-error"
+
+def navigate(page, url, timeouts, log=print):
+    """
+    Loads a page without waiting forever for the network to go idle.
+    
+    DOMContentLoaded and load must arrive within the 'navigate' timeout;
+    network idle gets 'settle' more seconds (0 skips it), after which the
+    capture goes on with what has loaded. Chatty sites (analytics beacons,
+    long polling) never go idle and used to burn the whole timeout.
+    
+    Returns:
+        tuple: (response, load state reached: 'networkidle', 'load' or 'domcontentloaded')
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    
+    started = time.monotonic()
+    # Playwright reads a 0 ms timeout as "no timeout"
+    response = page.goto(url, wait_until="domcontentloaded", timeout=max(1, timeouts["navigate"] * 1000))
+    load_state = "domcontentloaded"
+    try:
+        remaining = timeouts["navigate"] - (time.monotonic() - started)
+        page.wait_for_load_state("load", timeout=max(1, remaining * 1000))
+        load_state = "load"
+        if timeouts["settle"] > 0:
+            page.wait_for_load_state("networkidle", timeout=timeouts["settle"] * 1000)
+            load_state = "networkidle"
+    except PlaywrightTimeoutError:
+        waiting_for = "load" if load_state == "domcontentloaded" else "network idle"
+        log(f"⏱️  {waiting_for} not reached in time, continuing after '{load_state}'")
+    return response, load_state
+
+def wait_for_animations(page, wait_time, log=print):
+    """Waits the specified time for animations to load"""
+    if wait_time > 0:
+        log(f"⏳ Waiting {wait_time} seconds for animations to load...")
+        time.sleep(wait_time)
+
+# Optimized scroll - 80px steps (balance between speed and effectiveness)
+SCROLL_STEP_SIZE = 80
+# Optimized short pause (0.08s - fast but effective)
+SCROLL_STEP_PAUSE = 0.08
+
+# Use scrollBy for natural incremental scroll
+SCROLL_STEP_SCRIPT = f"""
+    window.scrollBy(0, {SCROLL_STEP_SIZE});
+    window.dispatchEvent(new Event('scroll'));
+"""
+
+# Force final state of common animations
+FORCE_ANIMATIONS_SCRIPT = """
+    // AOS (Animate On Scroll)
+    document.querySelectorAll('[data-aos]').forEach(el => {
+        el.classList.add('aos-animate');
+        el.style.opacity = '1';
+        el.style.transform = 'none';
+    });
+    
+    // GSAP ScrollTrigger refresh
+    if (typeof ScrollTrigger !== 'undefined') {
+        ScrollTrigger.getAll().forEach(st => st.refresh());
+    }
+    
+    // Intersection Observer - force visibility
+    document.querySelectorAll('[class*="fade"], [class*="slide"], [class*="animate"]').forEach(el => {
+        if (el.style.opacity === '0' || el.style.opacity === '') {
+            el.style.opacity = '1';
+        }
+        if (el.style.visibility === 'hidden') {
+            el.style.visibility = 'visible';
+        }
+    });
+    
+    // Trigger final scroll event
+    window.dispatchEvent(new Event('scroll'));
+    window.dispatchEvent(new Event('resize'));
+"""
+
+# Document-relative box of the first visible match of every selector, in a single evaluate
+ELEMENT_BOXES_SCRIPT = """
+    (selectors) => {
+        window.scrollTo(0, 0);
+        return selectors.map(selector => {
+            let elements;
+            try {
+                elements = Array.from(document.querySelectorAll(selector));
+            } catch (e) {
+                return {selector, error: 'invalid selector'};
+            }
+            if (!elements.length) {
+                return {selector, error: 'not found'};
+            }
+            for (const el of elements) {
+                const rect = el.getBoundingClientRect();
+                if (rect.width >= 1 && rect.height >= 1) {
+                    return {
+                        selector,
+                        x: Math.max(0, rect.left + window.scrollX),
+                        y: Math.max(0, rect.top + window.scrollY),
+                        width: rect.width,
+                        height: rect.height,
+                    };
+                }
+            }
+            return {selector, error: 'not visible'};
+        });
+    }
+"""
+
+def capture_elements(page, url, device_key, base_path, timestamp, selectors, log=print, sink=None, screenshot_timeout=None):
+    """
+    Captures the region of every selector from the already loaded page.
+
+    All bounding boxes are measured in one evaluate, then each region is
+    taken with a clip rectangle over the full page (no new navigation).
+    Returns one entry per selector: 'selector', 'path', 'box' and the image
+    info, or 'error' ('not found', 'not visible', 'invalid selector', or the
+    screenshot error). A failed element never fails the device capture
+    """
+    sink = sink or DEFAULT_SINK
+    elements = []
+    used_names = set()
+    try:
+        boxes = page.evaluate(ELEMENT_BOXES_SCRIPT, list(selectors))
+    except Exception as e:
+        log(f"⚠️  Could not measure the elements: {e}")
+        return [{"selector": selector, "path": None, "error": str(e)} for selector in selectors]
+    for box in boxes:
+        selector = box.pop("selector")
+        if "error" in box:
+            log(f"⚠️  Element {selector}: {box['error']}")
+            elements.append({"selector": selector, "path": None, "error": box["error"]})
+            continue
+        
+        # Two selectors with the same slug get numbered names
+        filename = generate_element_filename(url, device_key, timestamp, selector)
+        number = 2
+        while filename in used_names:
+            filename = generate_element_filename(url, device_key, timestamp, f"{selector}-{number}")
+            number += 1
+        used_names.add(filename)
+        
+        try:
+            data = page.screenshot(full_page=True, clip=box, timeout=screenshot_timeout)
+            location = sink.write(base_path / filename, data)
+        except Exception as e:
+            log(f"⚠️  Element {selector}: {e}")
+            elements.append({"selector": selector, "path": None, "box": box, "error": str(e)})
+            continue
+        elements.append(dict(image_info(data), selector=selector, path=location, box=box))
+        log(f"✅ Element capture ({selector}): {location}")
+    return elements
+
+def scroll_progress_message(step, steps, total_height):
+    """Returns the progress line to show at every 20% of the scroll, or None"""
+    progress = (step / steps) * 100
+    if progress % 20 < (100 / steps):
+        return f"📍 Progress: {int(progress)}% ({step * SCROLL_STEP_SIZE}px of {total_height}px)"
+    return None
+
+def smooth_scroll_page(page, log=print, timeout=None):
+    """
+    Performs smooth scroll down to trigger scroll-based animations.
+    With timeout (seconds) the steps stop early and the page jumps to the end
+    """
+    log("📜 Performing smooth scroll to trigger animations...")
+    
+    # Get total page height
+    total_height = page.evaluate("document.body.scrollHeight")
+    viewport_height = page.evaluate("window.innerHeight")
+    
+    log(f"📏 Total page height: {total_height}px, Viewport: {viewport_height}px")
+    
+    steps = int(total_height / SCROLL_STEP_SIZE)
+    
+    log(f"🔄 Performing smooth scroll in {steps} steps of {SCROLL_STEP_SIZE}px...")
+    
+    deadline = time.monotonic() + timeout if timeout else None
+    for i in range(steps):
+        if deadline is not None and time.monotonic() > deadline:
+            log(f"⏱️  Scroll stopped after {timeout:g}s at step {i} of {steps}")
+            break
+        page.evaluate(SCROLL_STEP_SCRIPT)
+        # Unlike time.sleep, Playwright keeps handling browser events (screencast frames) while waiting
+        page.wait_for_timeout(SCROLL_STEP_PAUSE * 1000)
+        
+        # Show progress every 20% of the journey
+        message = scroll_progress_message(i, steps, total_height)
+        if message:
+            log(message)
+    
+    # Ensure we reach the end
+    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    log("📍 Reached end of page")
+    
+    log("✨ Forcing final state of animations...")
+    page.evaluate(FORCE_ANIMATIONS_SCRIPT)
+    
+    # Final pause for animations to complete
+    page.wait_for_timeout(1000)
+    log("✅ Scroll completed - page ready for capture from the bottom")
+
+def capture_screenshot(url, device_key, device_config, base_path, timestamp, wait_time=3.0, smooth_scroll=False, auto_dismiss=False, log=print, sink=None, previous_fullpage=None, max_distance=DEFAULT_MAX_DISTANCE, elements=None, profile=(), timeouts=None, track_settle=False, filmstrip=None):
+    """
+    Captures screenshots of a URL for a specific device.
+
+    filmstrip: a wshot.filmstrip.FilmstripWriter; the smooth scroll is then
+    recorded with the screencast and queued for encoding ('filmstrip' holds
+    the frame count).
+
+    track_settle: measure how long the page kept changing after loading
+    (see wshot.settle) into 'settle', for the --wait-time auto history.
+
+    timeouts: per-phase limits in seconds overriding PHASE_TIMEOUTS. A
+    failure is reported with the 'phase' it happened in, its 'failure'
+    category (see classify_failure) and whether it is 'retryable'.
+
+    profile: kinds of wshot.profiling to collect; 'trace' records a
+    Playwright trace into <client>/profile/ and 'timing' adds the page's
+    Navigation/Resource Timing entries as 'performance'.
+
+    elements: CSS selectors whose regions are also captured, from the same
+    page load (see capture_elements).
+
+    previous_fullpage: catalog row of the last full page of this URL and
+    device; when the new full page is within max_distance bits of its
+    perceptual hash it is not stored again.
+
+    Returns:
+        dict: Capture result with 'status' ('ok' or 'failed'), the 'viewport'
+        and 'fullpage' locations (file paths with the default sink), their
+        size/hash/dimensions in 'files', per-phase 'timings' in seconds and
+        'error' when something went wrong. A skipped full page has no
+        location and its 'files' entry holds 'duplicate_of' and 'distance'. With elements, 'elements' lists
+        the capture_elements() entries
+    """
+    result = {"status": "failed", "viewport": None, "fullpage": None, "error": None, "timings": {}, "files": {}}
+    sink = sink or DEFAULT_SINK
+    timeouts = phase_timeouts(timeouts)
+    screenshot_timeout = max(1, timeouts["screenshot"] * 1000)
+    phase = "launch"
+    started = time.perf_counter()
+
+    # Only import playwright when needed
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        log("❌ Error: The 'playwright' library is not installed")
+        log("💡 Install with: pip install playwright")
+        log("💡 Then run: playwright install")
+        result["error"] = "playwright is not installed"
+        result["failure"] = "playwright-missing"
+        return result
+    
+    log(f"📱 Configuring: {device_config['nombre']} ({device_config['width']}x{device_config['height']})")
+    
+    with sync_playwright() as p:
+        browser = None
+        context = None
+        
+        try:
+            browser = p.chromium.launch(headless=True)
+            # Pixel ratio, user agent and touch/mobile flags make sites serve the device's own assets
+            page_options = browser_context_options(device_config)
+            if "trace" in profile:
+                # Tracing belongs to a browser context: one per device keeps traces separate
+                context = browser.new_context(**page_options)
+                context.tracing.start(screenshots=True, snapshots=True)
+                page = context.new_page()
+            else:
+                page = browser.new_page(**page_options)
+            if "timing" in profile:
+                from ..profiling import RESOURCE_BUFFER_SCRIPT
+                page.add_init_script(RESOURCE_BUFFER_SCRIPT)
+            
+            phase = "navigate"
+            log(f"📸 Navigating to: {url}")
+            # Browser startup stays out of it: the scheduler reads this as the host's latency
+            phase_start = time.perf_counter()
+            response, result["load_state"] = navigate(page, url, timeouts, log)
+            result["timings"]["navigate"] = time.perf_counter() - phase_start
+            if response is not None:
+                result["http_status"] = response.status
+            
+            # Throttled by the server: report it so the scheduler backs off and retries
+            if response is not None and response.status in RETRYABLE_STATUSES:
+                result["status"] = "rate-limited"
+                result["retry_after"] = parse_retry_after(response.headers.get("retry-after"))
+                log(f"🐢 {url} answered HTTP {response.status} on {device_key}")
+                return result
+            
+            # Wait specified time for animations
+            phase = "settle"
+            loaded_at = page_clock(page) if track_settle else None
+            phase_start = time.perf_counter()
+            wait_for_animations(page, wait_time, log)
+            result["timings"]["wait"] = time.perf_counter() - phase_start
+            if track_settle:
+                try:
+                    result["settle"] = measure_settle(page, loaded_at)
+                except Exception as e:
+                    log(f"⚠️  Could not measure the settle time: {e}")
+            
+            # Resource entries after the wait include lazy-loaded content
+            if "timing" in profile:
+                from ..profiling import performance_summary
+                result["performance"] = performance_summary(page)
+            
+            # Close pop-ups automatically if activated
+            if auto_dismiss:
+                phase = "dismiss"
+                from .popups import auto_dismiss_popups
+                phase_start = time.perf_counter()
+                auto_dismiss_popups(page, log, timeouts["dismiss"])
+                result["timings"]["dismiss"] = time.perf_counter() - phase_start
+            
+            # Captura normal (viewport)
+            phase = "screenshot"
+            normal_capture_filename = generate_capture_filename(url, device_key, timestamp, False)
+            normal_capture_path = base_path / normal_capture_filename
+            phase_start = time.perf_counter()
+            viewport_data = page.screenshot(timeout=screenshot_timeout)
+            result["viewport"] = sink.write(normal_capture_path, viewport_data)
+            result["files"]["viewport"] = image_info(viewport_data)
+            result["timings"]["viewport"] = time.perf_counter() - phase_start
+            log(f"✅ Viewport capture: {result['viewport']}")
+            
+            # Full capture (scrollable page)
+            if smooth_scroll:
+                phase = "scroll"
+                phase_start = time.perf_counter()
+                recorder = None
+                if filmstrip is not None:
+                    from ..filmstrip import ScreencastRecorder
+                    recorder = ScreencastRecorder(page, filmstrip.fps, device_config["width"], device_config["height"])
+                    recorder.start()
+                try:
+                    smooth_scroll_page(page, log, timeouts["scroll"])
+                finally:
+                    if recorder is not None:
+                        try:
+                            frames = recorder.stop()
+                        except Exception as e:
+                            log(f"⚠️  Could not stop the screencast: {e}")
+                            frames = recorder.frames
+                        count = filmstrip.submit(frames, filmstrip.filmstrip_path(base_path, normal_capture_filename),
+                                                 recorder.max_frames)
+                        result["filmstrip"] = {"frames": count, "format": filmstrip.format}
+                # Wait minimum time after smooth scroll
+                wait_for_animations(page, 1.0, log)  # Optimized minimum time
+                result["timings"]["scroll"] = time.perf_counter() - phase_start
+            
+            phase = "screenshot"
+            full_capture_filename = generate_capture_filename(url, device_key, timestamp, True)
+            full_capture_path = base_path / full_capture_filename
+            phase_start = time.perf_counter()
+            fullpage_data = page.screenshot(full_page=True, timeout=screenshot_timeout)
+            fullpage_info = image_info(fullpage_data)
+            distance = None
+            if previous_fullpage and previous_fullpage.get("phash") and fullpage_info["phash"]:
+                distance = hamming_distance(previous_fullpage["phash"], fullpage_info["phash"])
+            if distance is not None and distance <= max_distance:
+                # Same page as last time (give or take a banner): keep the previous file
+                fullpage_info.update(duplicate_of=previous_fullpage["path"], distance=distance)
+                log(f"♻️  Full page unchanged ({distance} bit(s) from {previous_fullpage['path']}), not stored")
+            else:
+                result["fullpage"] = sink.write(full_capture_path, fullpage_data)
+                log(f"✅ Full page capture: {result['fullpage']}")
+            result["files"]["fullpage"] = fullpage_info
+            result["timings"]["fullpage"] = time.perf_counter() - phase_start
+            
+            # Components (header, hero, footer...) cropped from the same page load
+            if elements:
+                phase = "elements"
+                phase_start = time.perf_counter()
+                result["elements"] = capture_elements(page, url, device_key, base_path, timestamp, elements, log, sink,
+                                                      screenshot_timeout)
+                result["timings"]["elements"] = time.perf_counter() - phase_start
+            result["status"] = "ok"
+            
+        except Exception as e:
+            result["error"] = str(e)
+            result["phase"] = phase
+            result["failure"] = classify_failure(e, phase)
+            result["retryable"] = result["failure"] in RETRYABLE_FAILURES or result["failure"].endswith("-timeout")
+            log(f"❌ Error capturing {url} on {device_key} ({result['failure']}): {e}")
+        finally:
+            if context is not None:
+                from ..profiling import PROFILE_FOLDER, stop_trace
+                trace_name = generate_capture_filename(url, device_key, timestamp, False).replace('.png', '-trace.zip')
+                try:
+                    result["trace"] = stop_trace(context, base_path.parent / PROFILE_FOLDER / trace_name, sink)
+                    log(f"🔬 Playwright trace: {result['trace']}")
+                except Exception as e:
+                    log(f"⚠️  Could not save the Playwright trace: {e}")
+            if browser is not None:
+                browser.close()
+            result["timings"]["total"] = time.perf_counter() - started
+
+    return result
@@ -0,0 +1,230 @@
+"""
+Device catalog: viewport sizes and browser emulation of every supported device
+
+Phones and tablets also carry their pixel ratio, user agent and touch/mobile
+flags, so sites serve them the same assets and layout as the real device.
+Devices and groups can be added or overridden from a config file (see
+load_device_config).
+"""
+
+IPHONE_USER_AGENT = ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+                     "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1")
+IPAD_USER_AGENT = ("Mozilla/5.0 (iPad; CPU OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+                   "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1")
+
+
+def _iphone(scale=3):
+    return {"device_scale_factor": scale, "is_mobile": True, "has_touch": True, "user_agent": IPHONE_USER_AGENT}
+
+
+def _ipad():
+    return {"device_scale_factor": 2, "is_mobile": True, "has_touch": True, "user_agent": IPAD_USER_AGENT}
+
+
+def _android(model, scale, tablet=False):
+    # Android tablets drop "Mobile" from the user agent and get desktop-like layouts
+    user_agent = (f"Mozilla/5.0 (Linux; Android 14; {model}) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  f"Chrome/120.0.0.0 {'' if tablet else 'Mobile '}Safari/537.36")
+    return {"device_scale_factor": scale, "is_mobile": True, "has_touch": True, "user_agent": user_agent}
+
+
+DEVICE_SIZES = {
+    # 📱 Mobile devices - default short names
+    "mobile": {"width": 393, "height": 852, "nombre": "iPhone 15 (default mobile)", **_iphone()},
+    "iphone-se": {"width": 375, "height": 667, "nombre": "iPhone SE (2022)", **_iphone(2)},
+    "iphone-15-pro": {"width": 393, "height": 852, "nombre": "iPhone 15 Pro", **_iphone()},
+    "iphone-17": {"width": 402, "height": 874, "nombre": "iPhone 17 (2025)", **_iphone()},
+    "galaxy-s23": {"width": 360, "height": 780, "nombre": "Samsung Galaxy S23", **_android("SM-S911B", 3)},
+    "galaxy-s23-ultra": {"width": 412, "height": 915, "nombre": "Samsung Galaxy S23 Ultra", **_android("SM-S918B", 3.5)},
+    "pixel-7": {"width": 412, "height": 892, "nombre": "Google Pixel 7", **_android("Pixel 7", 2.625)},
+
+    # 📱 Tablets - default short names
+    "tablet": {"width": 768, "height": 1024, "nombre": "iPad (default tablet)", **_ipad()},
+    "ipad-pro": {"width": 1024, "height": 1366, "nombre": "iPad Pro (12.9\")", **_ipad()},
+    "galaxy-tab-s9": {"width": 800, "height": 1280, "nombre": "Samsung Galaxy Tab S9", **_android("SM-X710", 2, tablet=True)},
+
+    # 💻 Laptops - default short names
+    "laptop": {"width": 1280, "height": 800, "nombre": "Laptop 13\" (default laptop)"},
+    "laptop-15": {"width": 1440, "height": 900, "nombre": "MacBook Pro 15\" / ThinkPad X1"},
+    "laptop-16": {"width": 1728, "height": 1117, "nombre": "MacBook Pro 16\""},
+
+    # 🖥️ Desktop - default short names
+    "desktop": {"width": 1920, "height": 1080, "nombre": "Full HD Monitor (default)"},
+    "desktop-2k": {"width": 2560, "height": 1440, "nombre": "Monitor 2K/QHD"},
+    "desktop-4k": {"width": 3840, "height": 2160, "nombre": "Monitor 4K/UHD"},
+
+    # 🏷️ Aliases for long names (compatibility)
+    "iphone-15": {"width": 393, "height": 852, "nombre": "iPhone 15 (alias for mobile)", **_iphone()},
+    "ipad": {"width": 768, "height": 1024, "nombre": "iPad (alias for tablet)", **_ipad()},
+    "laptop-13": {"width": 1280, "height": 800, "nombre": "Laptop 13\" (alias for laptop)"},
+    "desktop-fhd": {"width": 1920, "height": 1080, "nombre": "Monitor Full HD (alias for desktop)"},
+
+    # 🏷️ Legacy aliases (full compatibility)
+    "mobile-se": {"width": 375, "height": 667, "nombre": "iPhone SE (alias for iphone-se)", **_iphone(2)},
+    "mobile-17": {"width": 393, "height": 852, "nombre": "iPhone 15 (legacy alias)", **_iphone()}
+}
+
+# Named sets of devices for --devices (aliases are left out)
+DEVICE_GROUPS = {
+    "defaults": ["mobile", "tablet", "laptop", "desktop"],
+    "phones": ["mobile", "iphone-se", "iphone-15-pro", "iphone-17", "galaxy-s23", "galaxy-s23-ultra", "pixel-7"],
+    "tablets": ["tablet", "ipad-pro", "galaxy-tab-s9"],
+    "laptops": ["laptop", "laptop-15", "laptop-16"],
+    "desktops": ["desktop", "desktop-2k", "desktop-4k"],
+}
+
+# Device settings passed to Playwright as they are (new_page / new_context options)
+EMULATION_FIELDS = {"device_scale_factor": (int, float), "is_mobile": bool, "has_touch": bool, "user_agent": str}
+CONFIG_FILENAMES = ("devices.toml", "devices.yaml", "devices.yml", "devices.json")
+
+
+def browser_context_options(device_config):
+    """Playwright new_page()/new_context() options of a device: viewport plus its emulation settings"""
+    options = {"viewport": {"width": device_config["width"], "height": device_config["height"]}}
+    for field in EMULATION_FIELDS:
+        if device_config.get(field) is not None:
+            options[field] = device_config[field]
+    return options
+
+
+def expand_devices(names):
+    """
+    Device keys of a list of device and group names, in order and without
+    repeats ('all' is every device). Raises ValueError for unknown names
+    """
+    selected = []
+    unknown = []
+
+    def add(name, seen):
+        if name == "all":
+            selected.extend(key for key in DEVICE_SIZES if key not in selected)
+        elif name in DEVICE_GROUPS:
+            if name in seen:
+                return
+            for member in DEVICE_GROUPS[name]:
+                add(member, seen | {name})
+        elif name in DEVICE_SIZES:
+            if name not in selected:
+                selected.append(name)
+        elif name not in unknown:
+            unknown.append(name)
+
+    for name in names:
+        add(name.strip(), frozenset())
+    if unknown:
+        raise ValueError(f"unknown device(s) or group(s): {', '.join(unknown)} "
+                         f"(groups: {', '.join(DEVICE_GROUPS)}; devices: see wshot --info)")
+    return selected
+
+
+def find_device_config():
+    """The user's device config ($XDG_CONFIG_HOME or ~/.config)/wshot/devices.{toml,yaml,yml,json}, or None"""
+    import os
+    from pathlib import Path
+
+    config_home = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config")
+    for filename in CONFIG_FILENAMES:
+        path = config_home / "wshot" / filename
+        if path.is_file():
+            return path
+    return None
+
+
+def _read_config(path):
+    """Parses a TOML, YAML or JSON file according to its extension"""
+    suffix = path.suffix.lower()
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError("TOML device configs need Python 3.11+ or tomli: pip install tomli")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML device configs need PyYAML: pip install PyYAML")
+        with open(path, encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    if suffix == ".json":
+        import json
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    raise ValueError(f"{path}: unsupported config format (use .toml, .yaml, .yml or .json)")
+
+
+def _check_device(key, settings, existing):
+    """Validates one device entry and returns it in DEVICE_SIZES form"""
+    if not isinstance(settings, dict):
+        raise ValueError(f"devices.{key}: expected a table of settings")
+    device = dict(settings)
+    if "name" in device:
+        device["nombre"] = device.pop("name")
+    allowed = {"width", "height", "nombre", *EMULATION_FIELDS}
+    unexpected = sorted(set(device) - allowed)
+    if unexpected:
+        raise ValueError(f"devices.{key}: unknown setting(s) {', '.join(unexpected)} "
+                         f"(use width, height, name, {', '.join(EMULATION_FIELDS)})")
+    for field in ("width", "height"):
+        value = device.get(field, (existing or {}).get(field))
+        if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+            raise ValueError(f"devices.{key}: {field} must be a positive integer")
+    for field, types in EMULATION_FIELDS.items():
+        value = device.get(field)
+        # bool is an int subclass: true is not a scale factor
+        if value is not None and (not isinstance(value, types) or (types is not bool and isinstance(value, bool))):
+            raise ValueError(f"devices.{key}: invalid {field} {value!r}")
+    if device.get("device_scale_factor") is not None and device["device_scale_factor"] <= 0:
+        raise ValueError(f"devices.{key}: device_scale_factor must be positive")
+    return device
+
+
+def load_device_config(path):
+    """
+    Adds the devices and groups of a config file to DEVICE_SIZES and
+    DEVICE_GROUPS. A device that already exists is updated with the given
+    settings; new devices need width and height. Groups list device keys or
+    other groups. Returns (device keys, group names) defined by the file
+    """
+    from pathlib import Path
+
+    path = Path(path).expanduser()
+    config = _read_config(path)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: expected 'devices' and/or 'groups' at the top level")
+    unexpected = sorted(set(config) - {"devices", "groups"})
+    if unexpected:
+        raise ValueError(f"{path}: unknown section(s) {', '.join(unexpected)} (use devices and groups)")
+
+    devices = config.get("devices") or {}
+    groups = config.get("groups") or {}
+    if not isinstance(devices, dict) or not isinstance(groups, dict):
+        raise ValueError(f"{path}: 'devices' and 'groups' must be tables keyed by name")
+
+    try:
+        checked = {key: _check_device(key, settings, DEVICE_SIZES.get(key)) for key, settings in devices.items()}
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}")
+    for name, members in groups.items():
+        if isinstance(members, str):
+            members = [member.strip() for member in members.split(',')]
+        if not isinstance(members, list) or not all(isinstance(member, str) for member in members):
+            raise ValueError(f"{path}: groups.{name}: expected a list of device or group names")
+        if name in DEVICE_SIZES or name in checked or name == "all":
+            raise ValueError(f"{path}: groups.{name}: a group can't have the name of a device")
+        groups[name] = members
+
+    for key, device in checked.items():
+        DEVICE_SIZES[key] = dict(DEVICE_SIZES.get(key, {"nombre": key}), **device)
+    DEVICE_GROUPS.update(groups)
+    # Members are checked once everything is registered (groups may refer to each other)
+    try:
+        for name in groups:
+            expand_devices([name])
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}")
+    return list(checked), list(groups)
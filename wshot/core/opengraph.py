@@ -0,0 +1,346 @@
+"""
+OpenGraph extraction: og:*, standard and Twitter Card metadata plus og:image
+
+The same round-trip also collects the structured data SEO audits need, so one
+render serves both: JSON-LD blocks ('json_ld'), schema.org microdata items
+('microdata', in the WHATWG microdata JSON form), hreflang alternates
+('hreflang') and robots meta tags ('robots').
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from ..sinks import DEFAULT_SINK
+from .devices import DEVICE_SIZES
+
+# Collects og:*, standard, Twitter Card and structured metadata in a single round-trip
+OPENGRAPH_SCRIPT = """
+    () => {
+        const metaTags = document.querySelectorAll('meta[property^="og:"], meta[name^="og:"]');
+        const data = {};
+        
+        metaTags.forEach(tag => {
+            const property = tag.getAttribute('property') || tag.getAttribute('name'); 
+            const content = tag.getAttribute('content');
+            if (property && content) {
+                // Remove 'og:' prefix to simplify
+                const key = property.replace('og:', '');
+                data[key] = content;
+            }
+        });
+        
+        // Also extract relevant standard metadata 
+        const title = document.querySelector('title');
+        const description = document.querySelector('meta[name="description"]');
+        const keywords = document.querySelector('meta[name="keywords"]');
+        const canonical = document.querySelector('link[rel="canonical"]');
+        
+        // Add additional metadata if not present in og:
+        if (title && !data.title) {
+            data.title = title.textContent;
+        }
+        if (description && !data.description) {
+            data.description = description.getAttribute('content');
+        }
+        if (keywords) {
+            data.keywords = keywords.getAttribute('content');
+        }
+        if (canonical) {
+            data.canonical_url = canonical.getAttribute('href');
+        }
+        
+        // Twitter Card metadata (complementary)
+        const twitterCard = document.querySelector('meta[name="twitter:card"]');
+        const twitterSite = document.querySelector('meta[name="twitter:site"]');
+        const twitterCreator = document.querySelector('meta[name="twitter:creator"]');
+        
+        if (twitterCard) data.twitter_card = twitterCard.getAttribute('content');
+        if (twitterSite) data.twitter_site = twitterSite.getAttribute('content');
+        if (twitterCreator) data.twitter_creator = twitterCreator.getAttribute('content');
+        
+        // JSON-LD blocks, parsed (a block that is not valid JSON keeps the start of its text)
+        const jsonLd = [];
+        document.querySelectorAll('script[type="application/ld+json"]').forEach(script => {
+            const text = script.textContent.trim();
+            if (!text) return;
+            try {
+                jsonLd.push(JSON.parse(text));
+            } catch (e) {
+                jsonLd.push({error: e.message, raw: text.slice(0, 500)});
+            }
+        });
+        if (jsonLd.length) data.json_ld = jsonLd;
+        
+        // Microdata: top-level items with their nested items as property values
+        const microdataValue = element => {
+            if (element.hasAttribute('itemscope')) return microdataItem(element);
+            const tag = element.tagName.toLowerCase();
+            if (tag === 'meta') return element.getAttribute('content') || '';
+            if (['audio', 'embed', 'iframe', 'img', 'source', 'track', 'video'].includes(tag)) return element.src || '';
+            if (['a', 'area', 'link'].includes(tag)) return element.href || '';
+            if (tag === 'object') return element.data || '';
+            if (['data', 'meter'].includes(tag)) return element.getAttribute('value') || '';
+            if (tag === 'time' && element.hasAttribute('datetime')) return element.getAttribute('datetime');
+            return element.textContent.trim().replace(/\\s+/g, ' ').slice(0, 500);
+        };
+        const microdataItem = scope => {
+            const item = {};
+            const type = scope.getAttribute('itemtype');
+            if (type) item.type = type.trim().split(/\\s+/);
+            if (scope.hasAttribute('itemid')) item.id = scope.getAttribute('itemid');
+            item.properties = {};
+            const walk = parent => {
+                for (const child of parent.children) {
+                    if (child.hasAttribute('itemprop')) {
+                        const value = microdataValue(child);
+                        for (const name of child.getAttribute('itemprop').trim().split(/\\s+/)) {
+                            (item.properties[name] = item.properties[name] || []).push(value);
+                        }
+                    }
+                    // A nested item owns the properties inside it
+                    if (!child.hasAttribute('itemscope')) walk(child);
+                }
+            };
+            walk(scope);
+            return item;
+        };
+        const microdata = [...document.querySelectorAll('[itemscope]:not([itemprop])')].slice(0, 100).map(microdataItem);
+        if (microdata.length) data.microdata = microdata;
+        
+        // Language alternates
+        const hreflang = [...document.querySelectorAll('link[rel~="alternate"][hreflang]')]
+            .map(link => ({hreflang: link.getAttribute('hreflang'), href: link.href}));
+        if (hreflang.length) data.hreflang = hreflang;
+        
+        // Robots directives: robots and crawler-specific tags (googlebot, bingbot...)
+        const robots = {};
+        document.querySelectorAll('meta[name]').forEach(meta => {
+            const name = meta.getAttribute('name').toLowerCase();
+            if (name === 'robots' || /^[a-z-]*bot[a-z-]*$/.test(name)) robots[name] = meta.getAttribute('content') || '';
+        });
+        if (Object.keys(robots).length) data.robots = robots;
+        
+        return data;
+    }
+"""
+
+def extract_opengraph_metadata(page, url, base_path, timestamp, log=print, sink=None):
+    """
+    Extracts all OpenGraph metadata from the page and saves it to JSON.
+    Also downloads og:image images if available.
+    
+    Args:
+        page: Playwright page object
+        url: Page URL
+        base_path: Base path where to save files
+        timestamp: Timestamp for naming files
+        log: Function used for console output (print by default)
+        sink: Output sink for the JSON and image (files on disk by default)
+    
+    Returns:
+        dict: Dictionary with extracted metadata
+    """
+    log("🔍 Extracting OpenGraph metadata...")
+    
+    # Extract all og:* metadata from the page
+    og_data = page.evaluate(OPENGRAPH_SCRIPT)
+    
+    return save_opengraph_metadata(og_data, url, base_path, timestamp, log, sink)
+
+def json_ld_types(blocks):
+    """Sorted @type values of JSON-LD blocks (top-level nodes and @graph members)"""
+    types = set()
+    for block in blocks:
+        nodes = list(block) if isinstance(block, list) else [block]
+        for node in nodes:
+            if isinstance(node, dict) and isinstance(node.get('@graph'), list):
+                nodes.extend(node['@graph'])
+            elif isinstance(node, dict) and node.get('@type'):
+                node_type = node['@type']
+                types.update(node_type if isinstance(node_type, list) else [node_type])
+    return sorted(str(node_type) for node_type in types)
+
+def save_opengraph_metadata(og_data, url, base_path, timestamp, log=print, sink=None):
+    """
+    Saves metadata extracted with OPENGRAPH_SCRIPT to JSON and downloads og:image.
+    Shared by the sync CLI and the async API.
+    """
+    import json
+    
+    sink = sink or DEFAULT_SINK
+    
+    # Add additional information
+    og_data['extracted_at'] = datetime.now().isoformat()
+    og_data['source_url'] = url
+    og_data['timestamp'] = timestamp
+    
+    # Create opengraph folder
+    og_path = base_path / 'opengraph'
+    sink.makedirs(og_path)
+    
+    # Save JSON with metadata
+    json_filename = f"opengraph-{timestamp}.json"
+    json_path = og_path / json_filename
+    
+    json_location = sink.write(json_path, json.dumps(og_data, indent=2, ensure_ascii=False).encode('utf-8'))
+    
+    log(f"✅ OpenGraph metadata saved: {json_location}")
+    
+    # Download og:image if it exists
+    if 'image' in og_data and og_data['image']:
+        try:
+            import requests
+            from urllib.parse import urljoin
+            
+            image_url = og_data['image']
+            # Convert relative URL to absolute if necessary
+            if not image_url.startswith('http'):
+                image_url = urljoin(url, image_url)
+            
+            log(f"📥 Downloading OpenGraph image: {image_url}")
+            
+            response = requests.get(image_url, timeout=10, stream=True)
+            if response.status_code == 200:
+                from itertools import chain
+                from ..assets import sniff_type
+                
+                # Image extension from its first bytes, the URL as a fallback
+                chunks = response.iter_content(chunk_size=8192)
+                first_chunk = next(chunks, b'')
+                ext, _ = sniff_type(first_chunk)
+                if ext is None:
+                    ext = image_url.split('.')[-1].split('?')[0]
+                    if ext not in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
+                        ext = 'jpg'  # Default
+                
+                image_filename = f"og-image-{timestamp}.{ext}"
+                image_path = og_path / image_filename
+                
+                image_location = sink.write_stream(image_path, chain([first_chunk], chunks))
+                
+                log(f"✅ OpenGraph image downloaded: {image_location}")
+                og_data['image_local_path'] = image_location
+            else:
+                log(f"⚠️  Could not download image (Status: {response.status_code})")
+        except Exception as e:
+            log(f"⚠️  Error downloading OpenGraph image: {e}")
+    
+    # Show summary of found metadata
+    log(f"\n📊 OpenGraph metadata found:")
+    if 'title' in og_data:
+        log(f"   📌 Title: {og_data['title'][:80]}{'...' if len(og_data['title']) > 80 else ''}")
+    if 'description' in og_data:
+        log(f"   📝 Description: {og_data['description'][:80]}{'...' if len(og_data['description']) > 80 else ''}")
+    if 'type' in og_data:
+        log(f"   🏷️  Type: {og_data['type']}")
+    if 'image' in og_data:
+        log(f"   🖼️  Image: ✅")
+    if 'site_name' in og_data:
+        log(f"   🌐 Site: {og_data['site_name']}")
+    if 'json_ld' in og_data:
+        types = json_ld_types(og_data['json_ld'])
+        log(f"   🧩 JSON-LD: {len(og_data['json_ld'])} block(s)" + (f" ({', '.join(types)})" if types else ""))
+    if 'microdata' in og_data:
+        log(f"   🧩 Microdata: {len(og_data['microdata'])} item(s)")
+    if 'hreflang' in og_data:
+        log(f"   🌍 Hreflang: {', '.join(alternate['hreflang'] for alternate in og_data['hreflang'])}")
+    if 'robots' in og_data:
+        log(f"   🤖 Robots: {'; '.join(f'{name}: {content}' for name, content in og_data['robots'].items())}")
+    
+    log(f"   ℹ️  Total: {len(og_data)} fields extracted\n")
+    
+    return og_data
+
+class MetadataStream:
+    """
+    --metadata-ndjson: one JSON line per extracted page, flushed right away
+    so the file can be tailed or loaded while a batch run is going. Lines are
+    appended: shards and resumed runs can share the file.
+    """
+
+    def __init__(self, path):
+        from pathlib import Path
+
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        # Several URLs are extracted at the same time in parallel runs
+        self._lock = threading.Lock()
+
+    def write(self, og_data, client=None):
+        import json
+
+        line = json.dumps(dict(og_data, client=client), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def run_opengraph_extraction(url, base_path, timestamp, auto_dismiss=False, sink=None, assets=None, timeouts=None):
+    """
+    Opens the URL with a desktop viewport and extracts its OpenGraph metadata.
+    With assets (a wshot.assets.AssetHarvester), the media of the page are
+    queued for download too. timeouts: per-phase limits like
+    capture_screenshot (navigate, settle, dismiss).
+    """
+    # Import playwright for OpenGraph extraction
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print("❌ Error: The 'playwright' library is not installed")
+        print("💡 Install with: pip install playwright")
+        return None
+
+    from .capture import classify_failure, navigate, phase_timeouts
+
+    timeouts = phase_timeouts(timeouts)
+    og_data = None
+    phase = "navigate"
+    print(f"\n📊 Extracting OpenGraph metadata...")
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        # Use desktop viewport for OpenGraph
+        page = browser.new_page(viewport=DEVICE_SIZES['desktop'])
+        
+        # Images and media the page loaded, including ones set from scripts or CSS
+        network_urls = []
+        if assets is not None:
+            from ..assets import NETWORK_RESOURCE_TYPES
+            page.on("response", lambda response: network_urls.append(response.url)
+                    if response.request.resource_type in NETWORK_RESOURCE_TYPES and response.ok else None)
+        
+        try:
+            # Network idle is only waited for 'settle' seconds: chatty sites go on after 'load'
+            navigate(page, url, timeouts)
+            # Wait a bit for everything to load
+            time.sleep(2)
+            
+            # Close pop-ups if auto-dismiss is activated
+            if auto_dismiss:
+                phase = "dismiss"
+                from .popups import auto_dismiss_popups
+                auto_dismiss_popups(page, timeout=timeouts["dismiss"])
+            
+            # Extract OpenGraph
+            phase = "opengraph"
+            og_data = extract_opengraph_metadata(page, url, base_path, timestamp, sink=sink)
+            
+            if assets is not None:
+                from urllib.parse import urljoin
+                # og:image was just downloaded with the metadata
+                skip = {urljoin(url, og_data['image'])} if og_data.get('image_local_path') else ()
+                try:
+                    assets.harvest(page, url, base_path, timestamp, network_urls, skip)
+                except Exception as e:
+                    print(f"⚠️  Could not collect the media of the page: {e}")
+            
+        except Exception as e:
+            print(f"❌ Error extracting OpenGraph ({classify_failure(e, phase)}): {e}")
+        finally:
+            browser.close()
+
+    return og_data
@@ -0,0 +1,219 @@
+"""
+Pop-up dismissal: selector table for cookie banners, GDPR notices and modals
+
+Only imported when --auto-dismiss is used, the selector table is large.
+"""
+
+import time
+
+# Complete list of CSS selectors for accept/close cookie buttons
+# Includes common framework selectors, multilingual texts, and typical classes
+POPUP_CLOSE_SELECTORS = [
+    # Selectors by text in Spanish
+    'button:has-text("Aceptar")',
+    'button:has-text("Aceptar todo")',
+    'button:has-text("Aceptar todas")',
+    'button:has-text("Aceptar cookies")',
+    'button:has-text("Acepto")',
+    'button:has-text("Entendido")',
+    'button:has-text("De acuerdo")',
+    'button:has-text("Cerrar")',
+    'a:has-text("Aceptar")',
+    'a:has-text("Aceptar todo")',
+    'a:has-text("Cerrar")',
+    
+    # Selectors by text in English
+    'button:has-text("Accept")',
+    'button:has-text("Accept all")',
+    'button:has-text("Accept All")',
+    'button:has-text("Accept cookies")',
+    'button:has-text("Accept Cookies")',
+    'button:has-text("I accept")',
+    'button:has-text("I Accept")',
+    'button:has-text("Got it")',
+    'button:has-text("OK")',
+    'button:has-text("Close")',
+    'button:has-text("Agree")',
+    'button:has-text("I agree")',
+    'button:has-text("Continue")',
+    'button:has-text("Consent")',
+    'a:has-text("Accept")',
+    'a:has-text("Accept all")',
+    'a:has-text("Close")',
+    
+    # Selectors by text in French
+    'button:has-text("Accepter")',
+    'button:has-text("Tout accepter")',
+    'button:has-text("J\'accepte")',
+    'button:has-text("Fermer")',
+    'button:has-text("D\'accord")',
+    
+    # Selectors by text in German
+    'button:has-text("Akzeptieren")',
+    'button:has-text("Alle akzeptieren")',
+    'button:has-text("Ich akzeptiere")',
+    'button:has-text("Schließen")',
+    'button:has-text("Einverstanden")',
+    
+    # Selectores por texto en italiano
+    'button:has-text("Accetta")',
+    'button:has-text("Accetta tutto")',
+    'button:has-text("Accetto")',
+    'button:has-text("Chiudi")',
+    'button:has-text("Ho capito")',
+    
+    # Selectors by text in Portuguese
+    'button:has-text("Aceitar")',
+    'button:has-text("Aceitar tudo")',
+    'button:has-text("Eu aceito")',
+    'button:has-text("Fechar")',
+    'button:has-text("Entendi")',
+    
+    # Selectors by common classes (case insensitive)
+    '[class*="cookie" i][class*="accept" i]',
+    '[class*="cookie" i][class*="consent" i]',
+    '[class*="cookie" i][class*="agree" i]',
+    '[class*="cookie" i][class*="allow" i]',
+    '[class*="consent" i][class*="accept" i]',
+    '[class*="consent" i][class*="agree" i]',
+    '[class*="gdpr" i][class*="accept" i]',
+    '[class*="privacy" i][class*="accept" i]',
+    '[class*="banner" i][class*="accept" i]',
+    '[class*="modal" i][class*="accept" i]',
+    '[class*="popup" i][class*="accept" i]',
+    '[class*="notice" i][class*="accept" i]',
+    
+    # Selectors by specific common classes
+    '.cookie-consent-accept',
+    '.cookie-accept',
+    '.cookie-accept-all',
+    '.accept-cookies',
+    '.accept-all-cookies',
+    '.consent-accept',
+    '.gdpr-accept',
+    '.privacy-accept',
+    '#cookie-accept',
+    '#accept-cookies',
+    '#cookieConsent button',
+    '#cookieNotice button',
+    '.cc-accept',
+    '.cc-allow',
+    '.cc-dismiss',
+    
+    # Selectores por IDs comunes
+    '[id*="cookie" i][id*="accept" i]',
+    '[id*="cookie" i][id*="consent" i]',
+    '[id*="gdpr" i][id*="accept" i]',
+    '[id*="consent" i][id*="accept" i]',
+    
+    # Selectores para frameworks populares de cookies
+    # OneTrust
+    '#onetrust-accept-btn-handler',
+    '.onetrust-close-btn-handler',
+    '.optanon-allow-all-button',
+    
+    # Cookiebot
+    '#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll',
+    '#CybotCookiebotDialogBodyButtonAccept',
+    '.CybotCookiebotDialogBodyButton',
+    
+    # Cookie Consent
+    '.cc-btn.cc-allow',
+    '.cc-compliance button',
+    
+    # Quantcast
+    '.qc-cmp2-summary-buttons button[mode="primary"]',
+    'button[aria-label*="Accept" i]',
+    'button[aria-label*="Consent" i]',
+    
+    # TrustArc
+    '#truste-consent-button',
+    '.truste-button1',
+    
+    # Osano
+    '.osano-cm-accept',
+    '.osano-cm-accept-all',
+    
+    # Google Consent Mode
+    'button[data-google-interstitial-action="accept"]',
+    
+    # Selectores por atributos ARIA
+    'button[aria-label*="accept" i]',
+    'button[aria-label*="consent" i]',
+    'button[aria-label*="agree" i]',
+    'button[aria-label*="close" i]',
+    'button[aria-label*="dismiss" i]',
+    
+    # Botones de cerrar (X, close icons)
+    'button[class*="close" i]',
+    'button[aria-label="Close"]',
+    'button[aria-label="Cerrar"]',
+    '[class*="close-button" i]',
+    '[class*="dismiss" i]',
+    
+    # Generic selectors for modals/overlays
+    '.modal-footer button:first-child',
+    '.modal-actions button:first-child',
+    'div[role="dialog"] button:first-child',
+    'div[role="alertdialog"] button:first-child',
+]
+
+def auto_dismiss_popups(page, log=print, timeout=None):
+    """
+    Automatically detects and closes cookie banners, privacy notices 
+    and other pop-ups that block the screen.
+    
+    Searches for common accept/close buttons in multiple languages and popular frameworks.
+    With timeout (seconds) the search stops once that time is spent.
+    """
+    log("🔍 Detecting and closing pop-ups automatically...")
+    
+    closed_popups_count = 0
+    attempts = 0
+    max_attempts = len(POPUP_CLOSE_SELECTORS)
+    deadline = time.monotonic() + timeout if timeout else None
+    
+    # Try to close pop-ups with each selector
+    for selector in POPUP_CLOSE_SELECTORS:
+        if attempts >= max_attempts:
+            break
+        if deadline is not None and time.monotonic() > deadline:
+            log(f"⏱️  Pop-up search stopped after {timeout:g}s ({attempts} of {max_attempts} selectors tried)")
+            break
+            
+        try:
+            # Search for elements matching the selector (very short timeout)
+            popup_elements = page.locator(selector)
+            count = popup_elements.count()
+            
+            if count > 0:
+                # Try to click the first visible element
+                for i in range(count):
+                    try:
+                        popup_element = popup_elements.nth(i)
+                        # Check if visible before clicking
+                        if popup_element.is_visible(timeout=500):
+                            popup_element.click(timeout=1000)
+                            closed_popups_count += 1
+                            log(f"✅ Pop-up cerrado: {selector}")
+                            # Wait a moment for the animation to close
+                            time.sleep(0.5)
+                            break
+                    except:
+                        # If it fails with this element, try the next one
+                        continue
+                        
+        except Exception as e:
+            # Ignore errors and continue with the next selector
+            pass
+        
+        attempts += 1
+    
+    if closed_popups_count > 0:
+        log(f"✅ {closed_popups_count} pop-up(s) closed automatically")
+        # Wait an additional moment for any closing animation to finish
+        time.sleep(1.0)
+    else:
+        log("ℹ️  No pop-ups detected to close (or already closed)")
+    
+    return closed_popups_count
@@ -0,0 +1,559 @@
+"""
+Capture run: turns parsed CLI arguments into URL × device tasks and executes them
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from ..scheduler import CaptureScheduler
+from ..settle import DEFAULT_WAIT_TIME, HISTORY_SIZE, AutoWait, settle_budget
+from ..shard import (read_url_list, build_task_list, select_shard, summarize_tasks,
+                     WorkQueue, new_manifest, manifest_filename, write_manifest, encode_manifest)
+from ..sinks import FilesystemSink, TarSink, open_sink
+from .capture import capture_screenshot, PERMANENT_FAILURES
+from .devices import DEVICE_SIZES, expand_devices, find_device_config, load_device_config
+from .opengraph import MetadataStream, run_opengraph_extraction
+from .utils import (validar_url, extraer_nombre_cliente, resolve_output_root,
+                    create_device_folder_structure, open_file_explorer, prefixed_log, read_selector_list)
+
+
+def run_captures(args, parser):
+    """Runs the capture command (everything after argument parsing)"""
+    # Keep stdout clean for the archive stream (--stdout or --archive -): console output goes to stderr
+    stdout_stream = None
+    if args.stdout or args.archive == '-':
+        stdout_stream = sys.stdout.buffer
+        sys.stdout = sys.stderr
+    
+    # Collect URLs from the command line and the URL list
+    urls = [args.url] if args.url else []
+    if args.url_list:
+        try:
+            urls += [url for url in read_url_list(args.url_list) if url not in urls]
+        except OSError as e:
+            print(f"❌ Error reading URL list: {e}")
+            sys.exit(1)
+    
+    # If not --info, then URL is required
+    if not urls:
+        print(r"""
+                   _           _   
+                  | |         | |  
+     __      __ __| |__   ___ | |_ 
+     \ \ /\ / / __| '_ \ / _ \| __|
+      \ V  V /\__ \ | | | (_) | |_ 
+       \_/\_/ |___/_| |_|\___/ \__|
+                                     
+        """)
+        print("❌ Error: URL is required (or --url-list FILE)")
+        print("💡 Use --help for basic options or --info for complete guide")
+        parser.print_help()
+        sys.exit(1)
+    
+    # Element selectors from the command line and the selector file
+    elements = list(args.elements or [])
+    if args.elements_file:
+        try:
+            elements += [selector for selector in read_selector_list(args.elements_file) if selector not in elements]
+        except OSError as e:
+            print(f"❌ Error reading selector file: {e}")
+            sys.exit(1)
+    
+    if args.shard and args.queue:
+        print("❌ Error: --shard and --queue cannot be combined")
+        sys.exit(1)
+    
+    if args.stdout and args.archive:
+        print("❌ Error: --stdout and --archive cannot be combined")
+        sys.exit(1)
+    
+    # Several URLs, shards and queue workers all produce a run manifest
+    batch_mode = len(urls) > 1 or bool(args.shard) or bool(args.queue)
+    
+    # If --super is used, automatically activate optimized options
+    if args.super:
+        args.all_devices = True
+        args.smooth_scroll = True
+        args.open_graph = True  # Activar OpenGraph automáticamente en modo super
+        # If no custom wait_time was specified, use 2 seconds for super mode (optimized)
+        if args.wait_time == 3.0:  # default value
+            args.wait_time = 2.0
+    
+    # The filmstrip is a recording of the smooth scroll
+    if args.filmstrip:
+        if args.filmstrip_fps <= 0:
+            print("❌ Error: --filmstrip-fps must be a positive number")
+            sys.exit(1)
+        args.smooth_scroll = True
+    
+    # Assets are collected from the page loaded for OpenGraph
+    if args.assets:
+        if args.assets_max_mb <= 0 or args.asset_workers <= 0:
+            print("❌ Error: --assets-max-mb and --asset-workers must be positive numbers")
+            sys.exit(1)
+        args.open_graph = True
+    
+    # The metadata stream is fed by the OpenGraph pass
+    if args.metadata_ndjson:
+        args.open_graph = True
+    
+    # If --all is used, automatically activate OpenGraph
+    if args.all_devices and not args.open_graph:
+        args.open_graph = True
+    
+    # Validate arguments
+    if not args.all_devices and not args.device and not args.devices and not args.super:
+        print("❌ Error: You must specify -all, --device, --devices or --super")
+        print("💡 Use --help for basic options or --info for complete guide")
+        parser.print_help()
+        sys.exit(1)
+    
+    # Custom devices and groups: --device-config, else the user's config file if there is one
+    device_config_path = args.device_config or find_device_config()
+    if device_config_path:
+        try:
+            custom_devices, custom_groups = load_device_config(device_config_path)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"❌ Error loading device config: {e}")
+            sys.exit(1)
+        print(f"📱 Device config: {device_config_path} ({len(custom_devices)} device(s), {len(custom_groups)} group(s))")
+    
+    # Determine devices to use (--devices narrows -all and --super down to the matrix asked for)
+    try:
+        if args.devices:
+            selected_devices = expand_devices(args.devices.split(','))
+        elif args.all_devices:
+            selected_devices = list(DEVICE_SIZES.keys())
+        else:
+            selected_devices = expand_devices([args.device])
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    
+    # VALIDATE URL BEFORE CREATING FOLDERS
+    # (in batch mode each URL is validated when its first task comes up)
+    url_status = {}
+    if not batch_mode:
+        if not validar_url(urls[0]):
+            print(f"❌ Error: URL {urls[0]} does not respond or is not accessible")
+            print("💡 Verify that the URL is correct and available")
+            sys.exit(1)
+        url_status[urls[0]] = True
+    
+    # Auto-detect client or use provided one
+    url_label = urls[0] if len(urls) == 1 else f"{len(urls)} URLs"
+    client_label = args.client or (extraer_nombre_cliente(urls[0]) if len(urls) == 1 else "detected per URL")
+    
+    # Generate timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_id = args.run_id or timestamp
+    
+    wait_label = str(args.wait_time) if isinstance(args.wait_time, AutoWait) else f"{args.wait_time}s"
+    # A group given to --device ('--device phones') is reported like --devices
+    if args.all_devices or args.devices or selected_devices != [args.device]:
+        if args.super:
+            print(f"🚀 SUPER MODE ACTIVATED 🚀")
+            print(f"📱 Capturing URL: {url_label}")
+            print(f"👤 Client: {client_label}")
+            print(f"📱 Devices: {', '.join(selected_devices)}")
+            print(f"⏳ Wait time: {wait_label}")
+            print(f"📜 Smooth scroll: ✅ Activated")
+            print(f"📊 OpenGraph extraction: ✅ Activated")
+            if args.auto_dismiss:
+                print(f"🤖 Auto-dismiss pop-ups: ✅ Activated")
+        else:
+            print(f"🚀 Capturing URL: {url_label}")
+            print(f"👤 Client: {client_label}")
+            print(f"📱 Devices: {', '.join(selected_devices)}")
+            if args.open_graph:
+                print(f"📊 OpenGraph extraction: ✅ Activated")
+            if args.auto_dismiss:
+                print(f"🤖 Auto-dismiss pop-ups: ✅ Activated")
+    else:
+        print(f"🚀 Capturing URL: {url_label}")
+        print(f"👤 Client: {client_label}")
+        print(f"📱 Device: {args.device}")
+        if args.smooth_scroll:
+            print(f"📜 Smooth scroll: ✅ Activated")
+        if args.wait_time != 3.0:
+            print(f"⏳ Wait time: {wait_label}")
+        if args.open_graph:
+            print(f"📊 OpenGraph extraction: ✅ Activated")
+        if args.auto_dismiss:
+            print(f"🤖 Auto-dismiss pop-ups: ✅ Activated")
+    
+    if elements:
+        print(f"🧩 Elements: {', '.join(elements)}")
+    
+    # Where files go: the usual folders, a single archive, or a tar stream on stdout
+    output_root = resolve_output_root(args.output_dir)
+    if stdout_stream is not None:
+        sink = TarSink(stdout_stream, root=output_root)
+    else:
+        try:
+            sink = open_sink(args.archive, root=output_root)
+        except (ImportError, OSError) as e:
+            print(f"❌ Error opening archive {args.archive}: {e}")
+            sys.exit(1)
+        if args.archive:
+            print(f"📦 Archive: {sink.location} (one sequential write, no folders)")
+    on_disk = isinstance(sink, FilesystemSink)
+    
+    # Build the URL × device task list and keep this node's part of it
+    tasks = build_task_list(urls, selected_devices)
+    total_tasks = len(tasks)
+    queue = None
+    if args.queue:
+        queue = WorkQueue(args.queue)
+        added = queue.seed(tasks)
+        print(f"🧩 Queue: {queue.root} ({added} new task(s), worker {queue.worker})")
+        task_source = iter(queue)
+    else:
+        if args.shard:
+            tasks = select_shard(tasks, *args.shard)
+            print(f"🧩 Shard {args.shard[0]}/{args.shard[1]}: {len(tasks)} of {total_tasks} task(s)")
+        task_source = tasks
+    
+    # Device folders each URL needs on this node (only known in advance without a queue)
+    devices_by_url = {}
+    if queue is None:
+        for task in tasks:
+            devices_by_url.setdefault(task["url"], []).append(task["device"])
+    
+    # Profiling is off unless asked for: nothing of wshot.profiling is loaded otherwise
+    profile = args.profile or ()
+    task_profiler = None
+    if profile:
+        print(f"🔬 Profiling: {', '.join(profile)}")
+        if "python" in profile:
+            from ..profiling import PER_THREAD_PROFILERS, TaskProfiler
+            if not PER_THREAD_PROFILERS and args.concurrency > 1:
+                print("⚠️  --profile python on Python 3.12+ allows one profiler per process, capturing one task at a time")
+                args.concurrency = 1
+            task_profiler = TaskProfiler()
+    
+    # The timing entries and trace locations of a profiled run go to the manifest too
+    manifest = new_manifest(run_id, args.shard, total_tasks) if batch_mode or args.manifest or profile or args.archive else None
+    
+    # Searchable index of every capture across runs (archives and streams only with an explicit --catalog)
+    catalog = None
+    if not args.no_catalog and (on_disk or args.catalog):
+        from ..catalog import Catalog, default_catalog_path
+        catalog = Catalog(args.catalog or default_catalog_path(output_root))
+    
+    # Skipping unchanged full pages compares them with the previous run through the catalog
+    skip_similar = args.skip_similar
+    if skip_similar:
+        from ..similarity import phash_available
+        if catalog is None:
+            print("⚠️  --skip-similar needs the catalog (--no-catalog, or --stdout/--archive without --catalog), storing every full page")
+            skip_similar = False
+        elif not phash_available():
+            print("⚠️  --skip-similar needs Pillow (pip install Pillow numpy), storing every full page")
+            skip_similar = False
+        else:
+            print(f"♻️  Skip similar full pages: ✅ Activated (up to {args.similar_distance} bit(s) of difference)")
+    
+    # Every run with a catalog records how long pages took to settle; --wait-time auto waits that per host
+    auto_wait = args.wait_time if isinstance(args.wait_time, AutoWait) else None
+    if auto_wait is not None and catalog is None:
+        print(f"⚠️  --wait-time auto needs the catalog (--no-catalog, or --stdout/--archive without --catalog), "
+              f"waiting {min(auto_wait.cap, DEFAULT_WAIT_TIME)}s")
+    
+    # Thumbnails and contact sheets are made from the written files, in a thread pool
+    thumbnails = None
+    if args.thumbnails:
+        from ..images import ThumbnailPool, pillow_available
+        if not on_disk:
+            print("⚠️  --thumbnails needs the captures on disk (not available with --stdout or --archive), skipping them")
+        elif not pillow_available():
+            print("⚠️  --thumbnails needs Pillow (pip install Pillow), skipping them")
+        else:
+            thumbnails = ThumbnailPool(sink, args.thumbnail_width)
+            print(f"🖼️  Thumbnails and contact sheets: ✅ Activated ({args.thumbnail_width}px)")
+    remaining_by_url = {url: len(devices) for url, devices in devices_by_url.items()}
+    
+    # Scroll recordings are encoded in a background thread, through the sink
+    filmstrip = None
+    if args.filmstrip:
+        from ..filmstrip import FilmstripWriter, ffmpeg_available
+        from ..images import pillow_available
+        filmstrip_format = args.filmstrip
+        if filmstrip_format == "webm" and not ffmpeg_available():
+            print("⚠️  --filmstrip webm needs ffmpeg on the PATH, writing an animated WebP instead")
+            filmstrip_format = "webp"
+        if filmstrip_format != "webm" and not pillow_available():
+            print(f"⚠️  --filmstrip {filmstrip_format} needs Pillow (pip install Pillow), skipping it")
+        else:
+            filmstrip = FilmstripWriter(sink, filmstrip_format, args.filmstrip_fps)
+            print(f"🎞️  Scroll filmstrip: ✅ Activated ({filmstrip_format}, {args.filmstrip_fps} fps)")
+    
+    # Page media are downloaded in background threads, through the sink
+    harvester = None
+    if args.assets:
+        from ..assets import AssetHarvester
+        harvester = AssetHarvester(sink, args.asset_workers, int(args.assets_max_mb * 1024 * 1024),
+                                   args.per_host, args.host_rps)
+        print(f"🧲 Asset harvesting: ✅ Activated (up to {args.assets_max_mb:g} MB, {args.asset_workers} parallel downloads)")
+    
+    # SEO metadata of every page as NDJSON, written as each URL is extracted
+    metadata_stream = None
+    if args.metadata_ndjson:
+        try:
+            metadata_stream = MetadataStream(args.metadata_ndjson)
+        except OSError as e:
+            print(f"❌ Error opening {args.metadata_ndjson}: {e}")
+            sys.exit(1)
+        print(f"🧩 Metadata stream: {metadata_stream.path}")
+    
+    # Live metrics for long runs: nothing is loaded or served without --metrics-port
+    metrics = None
+    metrics_server = None
+    if args.metrics_port is not None:
+        from ..metrics import CaptureMetrics, serve_metrics
+        metrics = CaptureMetrics()
+        if queue is not None:
+            metrics.pending.function = queue.pending_count
+        else:
+            metrics.pending.set(len(tasks))
+        try:
+            metrics_server = serve_metrics(metrics, args.metrics_port, args.metrics_host)
+            print(f"📈 Metrics: http://{args.metrics_host}:{args.metrics_port}/metrics")
+        except OSError as e:
+            print(f"⚠️  Could not serve metrics on {args.metrics_host}:{args.metrics_port}: {e}")
+            metrics = None
+    
+    outcomes = []
+    base_paths = {}
+    # URLs whose DNS or TLS failed: their other devices are skipped right away
+    failed_urls = {}
+    opengraph_done = set()
+    url_locks = {}
+    state_lock = threading.Lock()
+    counter = [0]
+    # Tasks already announced: retries of a task don't count again
+    started_tasks = set()
+    parallel = args.concurrency > 1
+    
+    def process_task(task):
+        """Validates the URL, prepares its folders and OpenGraph once, then captures one device"""
+        url, device_key = task["url"], task["device"]
+        # Interleaved output from parallel workers is prefixed with the device
+        log = prefixed_log(f"[{device_key}]") if parallel else print
+        
+        with state_lock:
+            url_lock = url_locks.setdefault(url, threading.Lock())
+        
+        with url_lock:
+            # Validate each URL once, the first time one of its tasks comes up
+            if url not in url_status:
+                url_status[url] = validar_url(url)
+                if not url_status[url]:
+                    print(f"❌ Error: URL {url} does not respond or is not accessible, skipping it")
+            if not url_status[url]:
+                return {"status": "invalid-url", "failure": "invalid-url", "error": "URL does not respond or is not accessible"}
+            if url in failed_urls:
+                return {"status": "skipped", "failure": failed_urls[url],
+                        "error": f"skipped after a {failed_urls[url]} failure on another device"}
+            
+            client_name = args.client or extraer_nombre_cliente(url)
+            
+            # Create folder structure ONLY for requested devices
+            if queue is not None:
+                base_path = create_device_folder_structure(client_name, [device_key], args.output_dir, log, sink)
+                base_paths.setdefault(url, base_path)
+            elif url not in base_paths:
+                base_paths[url] = create_device_folder_structure(client_name, devices_by_url[url], args.output_dir, sink=sink)
+                print(f"📁 Base folder: {base_paths[url]}")
+                print("="*60)
+            base_path = base_paths[url]
+            
+            # Extract OpenGraph if activated (before the URL's captures)
+            if args.open_graph and task["opengraph"] and url not in opengraph_done:
+                opengraph_done.add(url)
+                opengraph_start = time.perf_counter()
+                og_data = run_opengraph_extraction(url, base_path, timestamp, args.auto_dismiss, sink, harvester,
+                                                   args.timeouts)
+                if metrics is not None:
+                    metrics.phases.observe(time.perf_counter() - opengraph_start, "opengraph")
+                if metadata_stream is not None and og_data:
+                    metadata_stream.write(og_data, client_name)
+                if manifest is not None and og_data:
+                    manifest["opengraph"].append({"url": url, "client": client_name, "data": og_data})
+                if catalog is not None and og_data:
+                    catalog.record_opengraph(url, client_name, timestamp, og_data,
+                                             str(base_path / 'opengraph' / f"opengraph-{timestamp}.json"))
+        
+        with state_lock:
+            first_attempt = task["id"] not in started_tasks
+            if first_attempt:
+                started_tasks.add(task["id"])
+                counter[0] += 1
+            i = counter[0]
+        # Retries were already announced by the scheduler
+        if first_attempt:
+            if queue is not None:
+                print(f"\n[{i}] Processing {device_key} ({url})...")
+            elif batch_mode:
+                print(f"\n[{i}/{len(tasks)}] Processing {device_key} ({url})...")
+            else:
+                print(f"\n[{i}/{len(tasks)}] Processing {device_key}...")
+        device_config = DEVICE_SIZES[device_key]
+        device_path = base_path / device_key
+        previous_fullpage = catalog.previous_capture(url, device_key, "fullpage") if skip_similar else None
+        
+        wait_time = args.wait_time
+        if auto_wait is not None:
+            history = catalog.settle_history(url, HISTORY_SIZE) if catalog is not None else []
+            wait_time = settle_budget(history, auto_wait.cap)
+            if wait_time is None:
+                wait_time = min(auto_wait.cap, DEFAULT_WAIT_TIME)
+                log(f"🧠 No settle history for this site yet, waiting {wait_time}s")
+            else:
+                log(f"🧠 Learned wait for this site: {wait_time}s (p95 of {len(history)} capture(s))")
+        
+        task_result = capture_screenshot(url, device_key, device_config, device_path, timestamp, wait_time, args.smooth_scroll, args.auto_dismiss, log, sink,
+                                         previous_fullpage, args.similar_distance, elements, profile, args.timeouts,
+                                         track_settle=catalog is not None, filmstrip=filmstrip)
+        task_result["client"] = client_name
+        return task_result
+    
+    def record_result(task, task_result):
+        """Stores the final result of a task (after rate-limit retries)"""
+        if task_result.get("status") == "rate-limited":
+            print(f"❌ Gave up on {task['url']} ({task['device']}): still rate limited")
+        if task_result.get("failure") in PERMANENT_FAILURES:
+            failed_urls.setdefault(task["url"], task_result["failure"])
+        outcomes.append(task_result)
+        if metrics is not None:
+            metrics.record(task_result)
+            if queue is None:
+                metrics.pending.dec()
+        if manifest is not None:
+            manifest["tasks"].append(dict(task, **task_result))
+        if queue is not None:
+            queue.complete(task, task_result)
+        if catalog is not None and (task_result.get("viewport") or task_result.get("fullpage")):
+            catalog.record_capture(task["url"], task_result["client"], task["device"],
+                                   DEVICE_SIZES[task["device"]], timestamp, task_result, run_id)
+        if catalog is not None and task_result.get("settle"):
+            catalog.record_settle(task["url"], task["device"], task_result["settle"], run_id)
+        if thumbnails is not None:
+            url = task["url"]
+            for capture_type in ("viewport", "fullpage"):
+                # A full page skipped as unchanged still shows up, from the previous file
+                source = task_result.get(capture_type) or task_result.get("files", {}).get(capture_type, {}).get("duplicate_of")
+                if source:
+                    thumbnails.add(url, task["device"], capture_type, source, base_paths[url], timestamp)
+            if url in remaining_by_url:
+                remaining_by_url[url] -= 1
+                if remaining_by_url[url] == 0:
+                    thumbnails.finish_url(url)
+    
+    if parallel:
+        print(f"⚡ Parallel captures: up to {args.concurrency} ({args.per_host} per host"
+              f"{f', {args.host_rps} req/s per host' if args.host_rps else ''}"
+              f"{', adaptive' if not args.no_adaptive else ''})")
+    
+    # Perform captures
+    scheduler = CaptureScheduler(args.concurrency, args.per_host, args.host_rps,
+                                 adaptive=not args.no_adaptive, failure_retries=args.retries)
+    if task_profiler is not None:
+        try:
+            task_profiler.start()
+        except ValueError as e:
+            print(f"⚠️  Could not start the Python profiler ({e}), running without it")
+            task_profiler = None
+    worker = task_profiler.wrap(process_task) if task_profiler else process_task
+    try:
+        scheduler.run(task_source, metrics.track(worker) if metrics is not None else worker, record_result)
+    finally:
+        if task_profiler is not None:
+            task_profiler.stop()
+        if queue is not None:
+            queue.close()
+    
+    base_path = next(iter(base_paths.values()), None)
+    
+    if thumbnails is not None:
+        # Queue workers can't know when a URL is complete: their sheets are built here
+        contact_sheets = thumbnails.close()
+        if contact_sheets:
+            print(f"\n🖼️  {len(contact_sheets)} contact sheet(s) in the thumbnails/ folder of each client")
+    
+    if filmstrip is not None:
+        filmstrips = filmstrip.close()
+        if filmstrips:
+            print(f"\n🎞️  {len(filmstrips)} filmstrip(s) in the filmstrip/ folder of each client")
+    
+    if harvester is not None:
+        harvested = harvester.close()
+        if manifest is not None:
+            manifest["assets"].extend(harvested)
+        if harvested:
+            print(f"\n🧲 {sum(page['files'] for page in harvested)} asset(s), "
+                  f"{sum(page['bytes'] for page in harvested) / 1048576:.1f} MB in the assets/ folder of each client")
+    
+    if metadata_stream is not None:
+        metadata_stream.close()
+        print(f"\n🧩 Page metadata: {metadata_stream.path}")
+    
+    if task_profiler is not None:
+        from ..profiling import PROFILE_FOLDER
+        stats_location = task_profiler.dump(output_root / PROFILE_FOLDER / f"python-{run_id}.prof", sink)
+        if stats_location:
+            print(f"\n🔬 Python profile: {stats_location} (python -m pstats {stats_location})")
+    
+    summary = summarize_tasks(outcomes)
+    if summary["by_failure"]:
+        print(f"\n❌ {sum(summary['by_failure'].values())} capture(s) failed: "
+              f"{', '.join(f'{failure} ×{count}' for failure, count in sorted(summary['by_failure'].items()))}")
+    
+    if manifest is not None:
+        manifest["finished_at"] = datetime.now().isoformat()
+        manifest["summary"] = summary
+        manifest_path = output_root / "manifests" / manifest_filename(run_id, args.shard)
+        if not on_disk:
+            # Archives and streams carry their own manifest, as the last entry
+            print(f"\n📋 Run manifest: {sink.write(manifest_path, encode_manifest(manifest))}")
+        if on_disk or args.manifest:
+            manifest_path = Path(args.manifest).expanduser() if args.manifest else manifest_path
+            write_manifest(manifest, manifest_path)
+            print(f"\n📋 Run manifest: {manifest_path}")
+    
+    sink.close()
+    
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    
+    if catalog is not None:
+        catalog.close()
+        print(f"\n📇 Catalog updated: {catalog.path}")
+    
+    # Several URLs end up in several client folders: point to the output root
+    if args.archive and args.archive != '-':
+        result_path = Path(args.archive).expanduser().resolve().parent
+    else:
+        result_path = base_path if len(base_paths) == 1 and queue is None else output_root
+    
+    print(r"""
+    ╔══════════════════════════════════════════════════════════════════╗
+    ║                                                                  ║
+    ║                             _           _                        ║
+    ║                            | |         | |                       ║
+    ║               __      __ __| |__   ___ | |_                      ║
+    ║               \ \ /\ / / __| '_ \ / _ \| __|                     ║
+    ║                \ V  V /\__ \ | | | (_) | |_                      ║
+    ║                 \_/\_/ |___/_| |_|\___/ \__|                     ║
+    ║                                                                  ║
+    ║                   🎉 Screenshots completed!                      ║
+    ╚══════════════════════════════════════════════════════════════════╝""")
+    print(f"📂 Check images at: {result_path}")
+    
+    # Open file explorer if requested
+    if args.open:
+        print("")
+        open_file_explorer(result_path)
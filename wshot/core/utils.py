@@ -0,0 +1,259 @@
+"""
+Utilities: URL validation, naming, output folders and file explorer
+"""
+
+import platform
+import re
+import subprocess
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from ..scheduler import RETRYABLE_STATUSES, parse_retry_after
+from ..similarity import perceptual_hash
+from ..sinks import DEFAULT_SINK
+
+def validar_url(url, max_retries=3, max_wait=60.0):
+    """
+    Validates that the URL responds before proceeding with captures.
+
+    HTTP 429/503 mean the server is up but throttling: the request is retried
+    after Retry-After (or an increasing delay) instead of failing right away.
+    """
+    # Import requests only when needed
+    try:
+        import requests
+        from requests.exceptions import RequestException, Timeout, ConnectionError
+    except ImportError:
+        print("❌ Error: The 'requests' library is not installed")
+        print("💡 Install with: pip install requests")
+        return False
+    
+    print(f"🔍 Validating URL: {url}")
+    
+    try:
+        for attempt in range(max_retries + 1):
+            # Try a HEAD request first (faster)
+            response = requests.head(url, timeout=10, allow_redirects=True)
+            
+            # If HEAD is not supported, try GET
+            if response.status_code == 405:  # Method Not Allowed
+                response = requests.get(url, timeout=10, allow_redirects=True)
+            
+            if response.status_code not in RETRYABLE_STATUSES or attempt == max_retries:
+                break
+            
+            delay = min(max_wait, parse_retry_after(response.headers.get('Retry-After'), 2.0 * 2 ** attempt))
+            print(f"🐢 Server is throttling (Status: {response.status_code}), retrying in {delay:.0f}s...")
+            time.sleep(delay)
+        
+        if response.status_code == 200:
+            print(f"✅ Valid URL (Status: {response.status_code})")
+            return True
+        else:
+            print(f"⚠️ URL responds but with status: {response.status_code}")
+            # Allow some codes that might work with Playwright
+            if response.status_code in [301, 302, 303, 307, 308]:
+                print(f"📝 Redirection detected, continuing...")
+                return True
+            # The site exists but rate limits us: captures back off on their own
+            if response.status_code == 429:
+                print(f"📝 Rate limited, continuing (captures will back off)...")
+                return True
+            return False
+            
+    except (ConnectionError, Timeout) as e:
+        print(f"❌ Connection error: {e}")
+        return False
+    except RequestException as e:
+        print(f"❌ Request error: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Unexpected error validating URL: {e}")
+        return False
+
+def extraer_nombre_cliente(url):
+    """Extracts the client name from the complete domain URL"""
+    try:
+        parsed = urlparse(url)
+        domain = parsed.netloc.lower()
+        # Remove www. if it exists
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        # Use the complete domain (ex: example.com instead of just example)
+        client_domain = domain
+        # Clean special characters but keep dots
+        client_domain = re.sub(r'[^a-zA-Z0-9\.]', '', client_domain)
+        return client_domain
+    except:
+        return "website"
+
+def capture_name_base(url):
+    """Returns the 'domain.com_path' prefix shared by every capture filename of a URL"""
+    parsed = urlparse(url)
+    
+    # Extract domain (without www.)
+    domain = parsed.netloc.lower()
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    
+    # Extract path and clean
+    path = parsed.path.strip('/')
+    if not path:
+        path_description = "main-page"
+    else:
+        path_description = path.replace('/', '-').replace('#', '-section-')
+    
+    # Clean special characters from path
+    path_description = re.sub(r'[^a-zA-Z0-9\-]', '', path_description)
+    if not path_description:
+        path_description = "main-page"
+    
+    # Clean special characters from domain but keep dots
+    domain_clean = re.sub(r'[^a-zA-Z0-9\.]', '', domain)
+    
+    return f"{domain_clean}_{path_description}"
+
+def generate_capture_filename(url, device, timestamp, es_completa=False):
+    """Creates descriptive filename including domain and path"""
+    try:
+        # Create name with format: domain.com_path-device-timestamp
+        nombre_base = capture_name_base(url)
+            
+        # Add suffix if it's a full capture
+        suffix = "-fullpage" if es_completa else ""
+        
+        return f"{nombre_base}-{device}{suffix}-{timestamp}.png"
+    except:
+        suffix = "-fullpage" if es_completa else ""
+        return f"capture-{device}{suffix}-{timestamp}.png"
+
+def selector_slug(selector):
+    """Filename-safe version of a CSS selector, ex: 'header .nav > a' -> 'header-nav-a'"""
+    return re.sub(r'[^a-zA-Z0-9]+', '-', selector).strip('-')[:40] or "element"
+
+def generate_element_filename(url, device, timestamp, selector):
+    """Filename of an element capture: domain.com_path-device-element-selector-timestamp"""
+    try:
+        nombre_base = capture_name_base(url)
+    except Exception:
+        nombre_base = "capture"
+    return f"{nombre_base}-{device}-element-{selector_slug(selector)}-{timestamp}.png"
+
+def read_selector_list(path):
+    """
+    Reads CSS selectors from a file, one per line. Lines starting with '# '
+    (hash and space) are comments, so id selectors like '#header' still work
+    """
+    selectors = []
+    for line in Path(path).expanduser().read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if line and line != '#' and not line.startswith('# ') and line not in selectors:
+            selectors.append(line)
+    return selectors
+
+def image_info(data):
+    """
+    Size, SHA-256, pixel dimensions (read from the PNG header) and perceptual
+    hash (None without Pillow) of an image
+    """
+    import hashlib
+    
+    info = {"size": len(data), "sha256": hashlib.sha256(data).hexdigest(), "width": None, "height": None}
+    # PNG: 8-byte signature, then the IHDR chunk with width and height (big endian)
+    if bytes(data[:8]) == b'\x89PNG\r\n\x1a\n' and len(data) >= 24:
+        info["width"] = int.from_bytes(data[16:20], 'big')
+        info["height"] = int.from_bytes(data[20:24], 'big')
+    info["phash"] = perceptual_hash(data)
+    return info
+
+def silent(*args, **kwargs):
+    """Drop-in replacement for print() when console output is not wanted"""
+
+def prefixed_log(prefix):
+    """print() variant that tags every line, for output of parallel workers"""
+    def log(message="", *args, **kwargs):
+        message = str(message)
+        # Keep leading blank lines before the prefix
+        stripped = message.lstrip('\n')
+        print(f"{message[:len(message) - len(stripped)]}{prefix} {stripped}", *args, **kwargs)
+    return log
+
+def resolve_output_root(output_dir=None):
+    """Returns the root output directory (without the client folder)"""
+    if output_dir:
+        # If a custom directory is specified
+        return Path(output_dir).expanduser()
+    # Default: 'WSHOT' folder in user's Pictures folder (cross-platform)
+    return Path.home() / "Pictures" / "WSHOT"
+
+def create_device_folder_structure(client_name, devices_to_use, output_dir=None, log=print, sink=None):
+    """Creates folder structure only for devices that will be used"""
+    # Determine the base output directory
+    base_output = resolve_output_root(output_dir)
+    
+    # Create the complete path with the client name
+    base_path = base_output / client_name
+    
+    for device_key in devices_to_use:
+        device_path = base_path / device_key
+        (sink or DEFAULT_SINK).makedirs(device_path)
+        log(f"📁 Folder verified: {device_path}")
+    
+    return base_path
+
+def open_file_explorer(file_path):
+    """
+    Opens the system file explorer at the specified path.
+    Works on Windows, macOS and Linux (automatically detects file manager).
+    """
+    file_path = Path(file_path).resolve()
+    
+    if not file_path.exists():
+        print(f"⚠️  Path {file_path} does not exist, cannot open explorer")
+        return False
+    
+    operating_system = platform.system()
+    
+    try:
+        if operating_system == "Windows":
+            # Windows: use explorer
+            subprocess.run(["explorer", str(file_path)], check=False)
+            print(f"📂 Opening Explorer at: {file_path}")
+            
+        elif operating_system == "Darwin":  # macOS
+            # macOS: use open
+            subprocess.run(["open", str(file_path)], check=False)
+            print(f"📂 Opening Finder at: {file_path}")
+            
+        elif operating_system == "Linux":
+            # Linux: try xdg-open (works with any default file manager)
+            # xdg-open automatically detects the desktop environment file manager
+            # (Dolphin en KDE, Nautilus en GNOME, Thunar en XFCE, etc.)
+            try:
+                subprocess.run(["xdg-open", str(file_path)], check=False, 
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                print(f"📂 Opening file explorer at: {file_path}")
+            except FileNotFoundError:
+                # If xdg-open is not available, try common managers
+                managers = ["dolphin", "nautilus", "thunar", "nemo", "caja", "pcmanfm"]
+                for manager in managers:
+                    try:
+                        subprocess.run([manager, str(file_path)], check=False,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                        print(f"📂 Opening {manager} at: {file_path}")
+                        break
+                    except FileNotFoundError:
+                        continue
+                else:
+                    print(f"⚠️  Could not detect a file explorer. Path: {file_path}")
+                    return False
+        else:
+            print(f"⚠️  Unsupported operating system: {operating_system}")
+            return False
+        
+        return True
+        
+    except Exception as e:
+        print(f"⚠️  Error opening file explorer: {e}")
+        return False
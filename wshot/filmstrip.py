@@ -0,0 +1,265 @@
+"""
+Scroll filmstrips: what scroll-driven animations look like while scrolling
+
+--smooth-scroll forces animations to their end state before the full page
+capture, so the full page never shows them in motion. With --filmstrip the
+scroll is recorded with Chromium's screencast (the browser pushes compressed
+frames as they are painted, no screenshot round-trips) and written as:
+
+  • webp    animated WebP (needs Pillow)
+  • sprite  JPEG sprite sheet, frames left to right then top to bottom (needs Pillow)
+  • webm    WebM video (needs ffmpeg on the PATH)
+
+    <client>/filmstrip/<capture name>-filmstrip.<webp|jpg|webm>
+
+Frames are at most FRAME_MAX_SIZE pixels on their longest side (the browser
+scales them before sending), resampled to --filmstrip-fps and encoded in a
+background thread, off the capture loop.
+"""
+
+import base64
+import io
+import threading
+from pathlib import Path
+
+FILMSTRIP_FORMATS = ("webp", "sprite", "webm")
+FILMSTRIP_FOLDER = "filmstrip"
+DEFAULT_FPS = 10
+# JPEG quality of the screencast frames
+FRAME_QUALITY = 70
+# Longest side of the screencast frames, in pixels
+FRAME_MAX_SIZE = 480
+# A long page at 10 fps is ~1 minute of frames; beyond this the filmstrip is cut
+MAX_FRAMES = 600
+# Decoded pixels of one filmstrip (~256 MB as RGBA): larger frames get fewer of them
+FRAME_PIXEL_BUDGET = 64_000_000
+SPRITE_COLUMNS = 10
+SPRITE_FRAME_WIDTH = 240
+EXTENSIONS = {"webp": "webp", "sprite": "jpg", "webm": "webm"}
+
+
+def ffmpeg_available():
+    import shutil
+
+    return shutil.which("ffmpeg") is not None
+
+
+def frame_size(width, height, max_size=FRAME_MAX_SIZE):
+    """(width, height) scaled down to fit max_size × max_size, aspect ratio kept"""
+    scale = min(1.0, max_size / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def max_frames(width, height):
+    """Frame cap of a filmstrip whose frames are width × height pixels"""
+    return max(1, min(MAX_FRAMES, FRAME_PIXEL_BUDGET // max(1, width * height)))
+
+
+def frame_runs(frames):
+    """[[jpeg bytes, count]] of a resampled list, repeated frames being the same object"""
+    runs = []
+    for frame in frames:
+        if runs and runs[-1][0] is frame:
+            runs[-1][1] += 1
+        else:
+            runs.append([frame, 1])
+    return runs
+
+
+def decode_frame(frame, max_size):
+    """RGB image of a JPEG frame, at most max_size pixels on its longest side"""
+    from PIL import Image
+    from .images import open_reduced
+
+    image = open_reduced(frame, max_size).convert('RGB')
+    image.thumbnail((max_size, max_size), Image.LANCZOS)
+    return image
+
+
+def resample(frames, fps, limit=MAX_FRAMES):
+    """
+    Constant-rate frame list from screencast frames [(timestamp, jpeg bytes)].
+
+    The browser only sends a frame when something was painted: each tick of
+    the output repeats the latest frame received before it (the same bytes
+    object), so pauses keep their real length. At most `limit` ticks
+    """
+    if not frames:
+        return []
+    step = 1.0 / fps
+    start, end = frames[0][0], frames[-1][0]
+    sampled = []
+    index = 0
+    tick = start
+    while tick <= end + 1e-9 and len(sampled) < limit:
+        while index + 1 < len(frames) and frames[index + 1][0] <= tick:
+            index += 1
+        sampled.append(frames[index][1])
+        tick += step
+    return sampled
+
+
+class ScreencastRecorder:
+    """
+    Records the frames Chromium paints on a page through the CDP screencast.
+
+    Frames arrive while Playwright calls are running (scroll steps and
+    page.wait_for_timeout pauses); each one is acknowledged right away so the
+    browser keeps sending them. Only the raw JPEG bytes are kept here,
+    decoding and encoding happen in FilmstripWriter. `max_frames` is the
+    frame cap for this viewport.
+    """
+
+    def __init__(self, page, fps=DEFAULT_FPS, width=None, height=None, quality=FRAME_QUALITY):
+        self.page = page
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.quality = quality
+        self.max_frames = max_frames(*frame_size(width, height)) if width and height else MAX_FRAMES
+        self.frames = []
+        self._session = None
+
+    def start(self):
+        self._session = self.page.context.new_cdp_session(self.page)
+        self._session.on("Page.screencastFrame", self._on_frame)
+        options = {"format": "jpeg", "quality": self.quality, "everyNthFrame": 1}
+        # Scaled by the browser: high-DPR and 4K devices would otherwise send huge frames
+        if self.width and self.height:
+            width, height = frame_size(self.width, self.height)
+            options.update(maxWidth=width, maxHeight=height)
+        self._session.send("Page.startScreencast", options)
+
+    def _on_frame(self, params):
+        self._session.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+        timestamp = params.get("metadata", {}).get("timestamp")
+        if timestamp is None:
+            return
+        data = base64.b64decode(params["data"])
+        # Frames closer than half an output frame add nothing once resampled: keep the latest paint
+        if self.frames and timestamp - self.frames[-1][0] < 0.5 / self.fps:
+            self.frames[-1] = (self.frames[-1][0], data)
+        elif len(self.frames) < self.max_frames * 2:
+            self.frames.append((timestamp, data))
+
+    def stop(self):
+        """Stops recording and returns the frames [(timestamp, jpeg bytes)]"""
+        if self._session is not None:
+            try:
+                self._session.send("Page.stopScreencast")
+                self._session.detach()
+            finally:
+                self._session = None
+        return self.frames
+
+
+def encode_webp(frames, fps, max_size=FRAME_MAX_SIZE):
+    """Animated WebP; a repeated frame is decoded once and shown longer"""
+    runs = frame_runs(frames)
+    images = [decode_frame(frame, max_size) for frame, _ in runs]
+    buffer = io.BytesIO()
+    images[0].save(buffer, format='WEBP', save_all=True, append_images=images[1:],
+                   duration=[round(count * 1000 / fps) for _, count in runs],
+                   loop=0, quality=FRAME_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def encode_sprite(frames, columns=SPRITE_COLUMNS, frame_width=SPRITE_FRAME_WIDTH):
+    from PIL import Image
+    from .images import encode_jpeg, open_reduced
+
+    runs = []
+    for frame, count in frame_runs(frames):
+        image = open_reduced(frame, frame_width).convert('RGB')
+        if image.width != frame_width:
+            image = image.resize((frame_width, max(1, round(image.height * frame_width / image.width))), Image.LANCZOS)
+        runs.append((image, count))
+    frame_height = max(image.height for image, _ in runs)
+    columns = min(columns, len(frames))
+    rows = (len(frames) + columns - 1) // columns
+    sheet = Image.new('RGB', (columns * frame_width, rows * frame_height), (255, 255, 255))
+    index = 0
+    for image, count in runs:
+        for _ in range(count):
+            sheet.paste(image, ((index % columns) * frame_width, (index // columns) * frame_height))
+            index += 1
+    return encode_jpeg(sheet)
+
+
+def encode_webm(frames, fps):
+    """Pipes the JPEG frames through ffmpeg (VP9)"""
+    import os
+    import subprocess
+    import tempfile
+
+    handle, temporary = tempfile.mkstemp(suffix=".webm")
+    os.close(handle)
+    try:
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "image2pipe", "-framerate", str(fps),
+                   "-c:v", "mjpeg", "-i", "-", "-c:v", "libvpx-vp9", "-b:v", "0", "-crf", "40",
+                   "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", temporary]
+        process = subprocess.run(command, input=b"".join(frames), capture_output=True)
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {process.stderr.decode(errors='replace').strip()}")
+        with open(temporary, 'rb') as f:
+            return f.read()
+    finally:
+        os.unlink(temporary)
+
+
+class FilmstripWriter:
+    """Encodes the recorded scrolls of a run in a background thread and writes them through the sink"""
+
+    def __init__(self, sink=None, filmstrip_format="webp", fps=DEFAULT_FPS, log=print):
+        from concurrent.futures import ThreadPoolExecutor
+        from .sinks import DEFAULT_SINK
+
+        self.sink = sink or DEFAULT_SINK
+        self.format = filmstrip_format
+        self.fps = fps
+        self.log = log
+        # One thread: encoders are CPU heavy and the captures are the priority
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wshot-filmstrip")
+        self._jobs = []
+        self._lock = threading.Lock()
+
+    def filmstrip_path(self, base_path, capture_filename):
+        """<client>/filmstrip/<capture name>-filmstrip.<ext> for a device folder and a viewport filename"""
+        name = Path(capture_filename).stem + f"-filmstrip.{EXTENSIONS[self.format]}"
+        return Path(base_path).parent / FILMSTRIP_FOLDER / name
+
+    def submit(self, frames, path, limit=MAX_FRAMES):
+        """
+        Queues the encoding of recorded frames into path. They are resampled
+        first, so the queue only holds the frames that will be used. Returns
+        how many
+        """
+        sampled = resample(frames, self.fps, limit)
+        if not sampled:
+            return 0
+        future = self._executor.submit(self._encode, sampled, path)
+        with self._lock:
+            self._jobs.append(future)
+        return len(sampled)
+
+    def _encode(self, sampled, path):
+        if self.format == "sprite":
+            data = encode_sprite(sampled)
+        elif self.format == "webm":
+            data = encode_webm(sampled, self.fps)
+        else:
+            data = encode_webp(sampled, self.fps)
+        location = self.sink.write(path, data)
+        self.log(f"🎞️  Filmstrip ({len(sampled)} frames): {location}")
+        return location
+
+    def close(self):
+        """Waits for every encoding and returns the filmstrip locations"""
+        self._executor.shutdown(wait=True)
+        locations = []
+        for future in self._jobs:
+            try:
+                locations.append(future.result())
+            except Exception as e:
+                self.log(f"⚠️  Filmstrip failed: {e}")
+        return locations
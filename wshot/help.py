@@ -0,0 +1,124 @@
+"""
+Extended guide shown by `wshot --info` (loaded only when requested)
+"""
+
+def display_extended_help():
+    """Show additional information about script usage"""
+    extended_help_text = r"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                                                                              ║
+║                                  _           _                               ║
+║                                 | |         | |                              ║
+║                    __      __ __| |__   ___ | |_                             ║
+║                    \ \ /\ / / __| '_ \ / _ \| __|                            ║
+║                     \ V  V /\__ \ | | | (_) | |_                             ║
+║                      \_/\_/ |___/_| |_|\___/ \__|                            ║
+║                                                                              ║
+║                    🚀 Enterprise Visual Audit Platform                      ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+📖 DESCRIPTION:
+   Wshot is a professional tool for taking website screenshots
+   across multiple devices, optimized for modern sites with
+   animations, scroll effects and dynamic content.
+
+🎯 MAIN FEATURES:
+   • Screenshots on 15+ predefined devices and resolutions
+   • Support for animations and delayed loading content
+   • Smooth scroll to trigger scroll-based animations
+   • Automatic closure of cookie banners and pop-ups 🤖
+   • OpenGraph metadata extraction for SEO and social media 📊
+   • Automatic file organization by client and device
+   • Super mode for optimized complete capture
+
+📱 AVAILABLE DEVICES:
+
+   🔥 SHORT NAMES (recommended):
+   mobile      │ iPhone 15       │ 393 × 852   │ Default mobile
+   tablet      │ iPad            │ 768 × 1024  │ Default tablet
+   laptop      │ Laptop 13"      │ 1280 × 800  │ Default laptop
+   desktop     │ Full HD Monitor │ 1920 × 1080 │ Default desktop
+
+   📱 SPECIFIC MOBILES:
+   iphone-se        │ iPhone SE (2022)      │ 375 × 667   │ Compact mobile
+   iphone-15-pro    │ iPhone 15 Pro         │ 393 × 852   │ Premium mobile
+   iphone-17        │ iPhone 17 (2025)      │ 402 × 874   │ Future mobile
+   galaxy-s23       │ Samsung Galaxy S23    │ 360 × 780   │ Standard Android
+   galaxy-s23-ultra │ Samsung Galaxy S23 U. │ 412 × 915   │ Premium Android
+   pixel-7          │ Google Pixel 7        │ 412 × 892   │ Pure Android
+
+   📱 SPECIFIC TABLETS:
+   ipad-pro         │ iPad Pro (12.9")      │ 1024 × 1366 │ Professional tablet
+   galaxy-tab-s9    │ Samsung Galaxy Tab S9 │ 800 × 1280  │ Android tablet
+
+   💻 SPECIFIC LAPTOPS:
+   laptop-15        │ MacBook Pro 15"       │ 1440 × 900  │ Standard laptop
+   laptop-16        │ MacBook Pro 16"       │ 1728 × 1117 │ Premium laptop
+
+   🖥️ SPECIFIC DESKTOPS:
+   desktop-2k       │ 2K/QHD Monitor        │ 2560 × 1440 │ Premium desktop
+   desktop-4k       │ 4K/UHD Monitor        │ 3840 × 2160 │ Professional desktop
+
+   Phones and tablets are emulated with their pixel ratio, user agent and touch.
+
+   👥 GROUPS (--devices):
+   defaults │ mobile, tablet, laptop, desktop
+   phones   │ every mobile above
+   tablets  │ tablet, ipad-pro, galaxy-tab-s9
+   laptops  │ laptop, laptop-15, laptop-16
+   desktops │ desktop, desktop-2k, desktop-4k
+
+🚀 USAGE MODES:
+
+   Basic (one device):
+   $ wshot https://example.com --device desktop
+
+   Complete (all devices):  
+   $ wshot https://example.com --all-devices
+
+   Only the matrix you need (groups and devices):
+   $ wshot https://example.com --devices phones,desktop
+
+   Super optimized (recommended for complex sites):
+   $ wshot https://example.com --super
+
+⚙️  ADVANCED OPTIONS:
+   --wait-time SECONDS     │ Wait time for animations (default: 3s)
+   --wait-time auto        │ Wait what each site needed in previous runs 🧠
+   --smooth-scroll         │ Smooth scroll before full page capture
+   --filmstrip [FORMAT]    │ Record the scroll (webp, sprite or webm) 🎞️
+   --auto-dismiss          │ Automatically close cookie banners and pop-ups 🤖
+   --open-graph, --og      │ Extract OpenGraph metadata (og:*, Twitter Card, JSON-LD, microdata) 📊
+   --metadata-ndjson FILE  │ Append the metadata of every page to an NDJSON file 🧩
+   --assets                │ Also download the images, videos and audio of each page 🧲
+   --client NAME           │ Custom name to organize files
+   --output-dir PATH       │ Custom output directory
+   --open                  │ Open file explorer when finished
+   --device-config FILE    │ Own devices and groups (TOML/YAML/JSON) 📱
+
+📂 FILE STRUCTURE:
+   Screenshots are saved by default in:
+   ~/Pictures/WSHOT/ (folder in user Pictures)
+   └── [client]/
+       ├── mobile-se/
+       ├── mobile-17/ 
+       ├── tablet/
+       └── desktop/
+           ├── page-viewport-20241004_143025.png
+           └── page-fullpage-20241004_143025.png
+   
+   Use --output-dir to save in another location like:
+   ~/Pictures/Wshot or ~/Downloads/Wshot
+
+💡 TIPS:
+   • Use --super for sites with many animations
+   • Use higher --wait-time for slow sites
+   • Smooth scroll is ideal for lazy loading and parallax
+   • Use --auto-dismiss for sites with annoying cookie banners
+   • Combine --auto-dismiss with --super for perfect captures without pop-ups
+   • Use --og or --open-graph to extract SEO and social media metadata
+   • --all and --super modes automatically include OpenGraph extraction
+   • URLs must include http:// or https://
+
+"""
+    print(extended_help_text)
@@ -0,0 +1,196 @@
+"""
+Image helpers: reduced decoding, thumbnails and per-URL contact sheets
+
+Reviewing a --super run means opening dozens of multi-MB PNGs per URL. With
+--thumbnails every capture also gets a small JPEG and each URL a contact sheet
+(one column per device, viewport above full page), written next to the
+OpenGraph folder:
+
+    <client>/thumbnails/<capture name>.jpg
+    <client>/thumbnails/contact-sheet-<name base>-<timestamp>.jpg
+
+JPEG/WebP images are shrunk while they are decoded (draft). PNG captures are
+decoded at full size and then reduced, so each pool thread holds one full
+capture at a time (a 4K full page can take hundreds of MB). The work runs in
+a thread pool, off the capture loop. Needs Pillow: pip install Pillow
+"""
+
+import io
+import os
+import threading
+from pathlib import Path
+
+THUMBNAIL_FOLDER = "thumbnails"
+THUMBNAIL_WIDTH = 320
+JPEG_QUALITY = 80
+# Full pages are cut at this height in contact sheets (their thumbnail keeps the whole page)
+SHEET_FULLPAGE_MAX_HEIGHT = 1600
+SHEET_LABEL_HEIGHT = 24
+SHEET_GAP = 8
+SHEET_BACKGROUND = (255, 255, 255)
+
+
+def pillow_available():
+    """True when Pillow is installed"""
+    import importlib.util
+
+    return importlib.util.find_spec("PIL") is not None
+
+
+def open_reduced(source, width, height=None):
+    """
+    Opens an image (path or bytes) shrunk to no less than width x height.
+
+    JPEG/WebP are decoded at a reduced scale (draft); other formats, PNG
+    included, are decoded at full size first. reduce() then averages whole
+    pixel blocks, which is far cheaper than resampling the full resolution.
+    Without height the aspect ratio is kept.
+    """
+    from PIL import Image
+
+    image = Image.open(source if isinstance(source, (str, Path)) else io.BytesIO(bytes(source)))
+    with image:
+        image.draft('RGB', (width, height or 1))
+        if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGB')
+        if height is None:
+            factor = max(1, image.width // width)
+            factor = (factor, factor)
+        else:
+            factor = (max(1, image.width // width), max(1, image.height // height))
+        if factor != (1, 1):
+            return image.reduce(factor)
+        image.load()
+        return image.copy()
+
+
+def make_thumbnail(source, width=THUMBNAIL_WIDTH):
+    """RGB thumbnail `width` pixels wide (never enlarged), aspect ratio kept"""
+    from PIL import Image
+
+    image = open_reduced(source, width).convert('RGB')
+    if image.width > width:
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+    return image
+
+
+def encode_jpeg(image, quality=JPEG_QUALITY):
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def build_contact_sheet(columns, width=THUMBNAIL_WIDTH):
+    """
+    Lays out thumbnails side by side.
+
+    columns: [(label, viewport image or None, full page image or None)], one
+    per device. Full pages are cut at SHEET_FULLPAGE_MAX_HEIGHT.
+    """
+    from PIL import Image, ImageDraw
+
+    def row_height(images):
+        return max((image.height for image in images if image is not None), default=0)
+
+    viewports = [viewport for _, viewport, _ in columns]
+    fullpages = [fullpage.crop((0, 0, fullpage.width, min(fullpage.height, SHEET_FULLPAGE_MAX_HEIGHT)))
+                 if fullpage is not None else None for _, _, fullpage in columns]
+    viewport_height = row_height(viewports)
+    fullpage_top = SHEET_LABEL_HEIGHT + viewport_height + (SHEET_GAP if viewport_height else 0)
+
+    sheet = Image.new('RGB', (SHEET_GAP + len(columns) * (width + SHEET_GAP),
+                              fullpage_top + row_height(fullpages) + SHEET_GAP), SHEET_BACKGROUND)
+    draw = ImageDraw.Draw(sheet)
+    for index, (label, _, _) in enumerate(columns):
+        left = SHEET_GAP + index * (width + SHEET_GAP)
+        draw.text((left, 6), label, fill=(60, 60, 60))
+        if viewports[index] is not None:
+            sheet.paste(viewports[index], (left, SHEET_LABEL_HEIGHT))
+        if fullpages[index] is not None:
+            sheet.paste(fullpages[index], (left, fullpage_top))
+    return sheet
+
+
+class ThumbnailPool:
+    """
+    Generates thumbnails and contact sheets in background threads.
+
+    add() queues the thumbnail of a capture as soon as it is written and
+    finish_url() queues the contact sheet of a URL once all its captures are
+    in. Pillow releases the GIL while decoding and resizing, so the threads
+    really run in parallel with the captures.
+    """
+
+    def __init__(self, sink=None, width=THUMBNAIL_WIDTH, workers=None, log=print):
+        from concurrent.futures import ThreadPoolExecutor
+        from .sinks import DEFAULT_SINK
+
+        self.sink = sink or DEFAULT_SINK
+        self.width = width
+        self.log = log
+        self._executor = ThreadPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1),
+                                            thread_name_prefix="wshot-thumbnails")
+        self._lock = threading.Lock()
+        self._urls = {}
+        self._sheets = []
+
+    def add(self, url, device_key, capture_type, source, base_path, timestamp):
+        """Queues the thumbnail of one capture file (viewport or fullpage)"""
+        future = self._executor.submit(self._thumbnail, source, base_path)
+        with self._lock:
+            entry = self._urls.setdefault(url, {"base_path": base_path, "timestamp": timestamp, "devices": {}})
+            entry["devices"].setdefault(device_key, {})[capture_type] = (source, future)
+
+    def _thumbnail(self, source, base_path):
+        image = make_thumbnail(source, self.width)
+        self.sink.write(base_path / THUMBNAIL_FOLDER / f"{Path(source).stem}.jpg", encode_jpeg(image))
+        return image
+
+    def finish_url(self, url):
+        """Queues the contact sheet of a URL (after the thumbnails already queued)"""
+        with self._lock:
+            entry = self._urls.pop(url, None)
+        if entry is not None:
+            # The pool is FIFO: by the time this job starts, the thumbnails it waits for are running or done
+            self._sheets.append(self._executor.submit(self._contact_sheet, url, entry))
+
+    def _contact_sheet(self, url, entry):
+        from .core.devices import DEVICE_SIZES
+        from .core.utils import capture_name_base
+
+        columns = []
+        for device_key in sorted(entry["devices"], key=lambda key: list(DEVICE_SIZES).index(key)
+                                 if key in DEVICE_SIZES else len(DEVICE_SIZES)):
+            images = {}
+            for capture_type, (source, future) in entry["devices"][device_key].items():
+                try:
+                    images[capture_type] = future.result()
+                except Exception as e:
+                    self.log(f"⚠️  Thumbnail failed for {source}: {e}")
+            device_config = DEVICE_SIZES.get(device_key)
+            label = f"{device_config['nombre']} ({device_config['width']}x{device_config['height']})" if device_config else device_key
+            columns.append((label, images.get("viewport"), images.get("fullpage")))
+
+        if all(viewport is None and fullpage is None for _, viewport, fullpage in columns):
+            return None
+        sheet = build_contact_sheet(columns, self.width)
+        path = entry["base_path"] / THUMBNAIL_FOLDER / f"contact-sheet-{capture_name_base(url)}-{entry['timestamp']}.jpg"
+        location = self.sink.write(path, encode_jpeg(sheet))
+        self.log(f"🖼️  Contact sheet: {location}")
+        return location
+
+    def close(self):
+        """Builds the sheets of URLs still open, waits for every job and returns the sheet locations"""
+        for url in list(self._urls):
+            self.finish_url(url)
+        self._executor.shutdown(wait=True)
+        locations = []
+        for future in self._sheets:
+            try:
+                location = future.result()
+            except Exception as e:
+                self.log(f"⚠️  Contact sheet failed: {e}")
+                continue
+            if location:
+                locations.append(location)
+        return locations
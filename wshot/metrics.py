@@ -0,0 +1,243 @@
+"""
+Metrics endpoint: Prometheus text format over plain local HTTP
+
+    wshot --url-list urls.txt -all --metrics-port 9464
+    curl http://127.0.0.1:9464/metrics
+
+Exposes captures in flight, pending tasks, per-phase latency histograms
+(navigate, wait, dismiss, scroll, screenshots, OpenGraph...), captures by
+status, failures by category, retries, bytes written and the RSS of the
+browser processes. Metrics are fed once per finished task from the timings
+the capture already measures, so leaving the endpoint on costs a few
+dictionary updates per capture; the RSS is only read when scraped.
+"""
+
+import os
+import threading
+
+# Seconds: page phases go from tens of milliseconds to the navigation timeout
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value):
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [(self.name, _labels(self.label_names, key), value) for key, value in sorted(values.items())]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, or is read from `function` at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=(), function=None):
+        super().__init__(name, help_text, labels)
+        self.function = function
+
+    def set(self, value, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+    def dec(self, amount=1, *label_values):
+        self.inc(-amount, *label_values)
+
+    def samples(self):
+        if self.function is not None:
+            value = self.function()
+            return [] if value is None else [(self.name, "", value)]
+        return super().samples()
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.setdefault(label_values, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def samples(self):
+        with self._lock:
+            series_items = [(key, dict(series, counts=list(series["counts"])))
+                            for key, series in sorted(self._series.items())]
+        samples = []
+        for key, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", _labels(self.label_names + ("le",), key + (_number(bound),)),
+                                cumulative))
+            samples.append((f"{self.name}_bucket", _labels(self.label_names + ("le",), key + ("+Inf",)),
+                            series["count"]))
+            samples.append((f"{self.name}_sum", _labels(self.label_names, key), series["sum"]))
+            samples.append((f"{self.name}_count", _labels(self.label_names, key), series["count"]))
+        return samples
+
+
+def browser_rss_bytes():
+    """
+    Resident memory of every child process (Chromium and its renderers).
+    Uses psutil when installed, else /proc on Linux; None elsewhere
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    if not os.path.isdir("/proc/self/task"):
+        return None
+    total = 0
+    pending = [str(os.getpid())]
+    while pending:
+        pid = pending.pop()
+        try:
+            for task in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{task}/children") as f:
+                    pending += f.read().split()
+        except OSError:
+            continue
+        if pid == str(os.getpid()):
+            continue
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class CaptureMetrics:
+    """The metrics of a capture run, updated by the runner"""
+
+    def __init__(self):
+        self.in_flight = Gauge("wshot_captures_in_flight", "Captures currently running")
+        self.pending = Gauge("wshot_tasks_pending", "URL x device tasks not finished yet (this node, or the whole --queue)")
+        self.captures = Counter("wshot_captures_total", "Finished capture tasks by final status", ["status"])
+        self.failures = Counter("wshot_capture_failures_total", "Failed capture tasks by category", ["category"])
+        self.retries = Counter("wshot_capture_retries_total", "Extra attempts after rate limiting or transient failures")
+        self.bytes_written = Counter("wshot_bytes_written_total", "Bytes of screenshots produced", ["capture_type"])
+        self.phases = Histogram("wshot_phase_duration_seconds", "Duration of capture phases", ["phase"])
+        self.browser_rss = Gauge("wshot_browser_rss_bytes", "Resident memory of the browser processes",
+                                 function=browser_rss_bytes)
+        self.in_flight.set(0)
+        self._metrics = [self.in_flight, self.pending, self.captures, self.failures, self.retries,
+                         self.bytes_written, self.phases, self.browser_rss]
+
+    def track(self, worker):
+        """Wraps a scheduler worker to count the captures in flight"""
+        def tracked(task):
+            self.in_flight.inc()
+            try:
+                return worker(task)
+            finally:
+                self.in_flight.dec()
+        return tracked
+
+    def record(self, result):
+        """Feeds the final result of a task: status, failure, retries, phase timings and sizes"""
+        status = result.get("status", "unknown")
+        self.captures.inc(1, status)
+        if status != "ok" and result.get("failure"):
+            self.failures.inc(1, result["failure"])
+        if result.get("attempts", 1) > 1:
+            self.retries.inc(result["attempts"] - 1)
+        for phase, seconds in (result.get("timings") or {}).items():
+            self.phases.observe(seconds, phase)
+        for capture_type, info in (result.get("files") or {}).items():
+            if result.get(capture_type) and info.get("size"):
+                self.bytes_written.inc(info["size"], capture_type)
+        for element in result.get("elements") or []:
+            if element.get("path") and element.get("size"):
+                self.bytes_written.inc(element["size"], "element")
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(metrics, port, host="127.0.0.1"):
+    """Serves /metrics from a daemon thread. Returns the server (call shutdown() to stop it)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            # Scrapes every few seconds would flood the capture output
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="wshot-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,169 @@
+"""
+Profiling hooks: where does the time of a slow capture go?
+
+  • trace: a Playwright trace per device (network, screenshots, DOM snapshots,
+    console), open it with `playwright show-trace <file>`
+  • python: wshot itself under cProfile, one stats file for the whole run,
+    open it with `python -m pstats <file>` or snakeviz
+  • timing: the page's Navigation and Resource Timing entries, added to the
+    run manifest
+
+Everything lands in <output-dir>/profile/ (or the archive of a non-filesystem
+sink). Nothing here is imported unless --profile is given.
+"""
+
+import sys
+import threading
+
+# Python 3.12+ profiles through sys.monitoring: one active cProfile per process
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+PROFILE_KINDS = ("trace", "python", "timing")
+PROFILE_FOLDER = "profile"
+
+# Browsers keep 250 resource entries by default; pages with more would be cut
+RESOURCE_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(10000)"
+
+PERFORMANCE_TIMING_SCRIPT = """
+    () => {
+        const round = value => typeof value === 'number' ? Math.round(value * 10) / 10 : value;
+        const pick = (entry, keys) => Object.fromEntries(keys.map(key => [key, round(entry[key])]));
+        const navigation = performance.getEntriesByType('navigation')[0];
+        return {
+            navigation: navigation ? pick(navigation, [
+                'startTime', 'redirectEnd', 'domainLookupStart', 'domainLookupEnd', 'connectStart',
+                'connectEnd', 'secureConnectionStart', 'requestStart', 'responseStart', 'responseEnd',
+                'domInteractive', 'domContentLoadedEventEnd', 'loadEventEnd', 'duration',
+                'transferSize', 'encodedBodySize', 'decodedBodySize', 'nextHopProtocol']) : null,
+            paint: performance.getEntriesByType('paint').map(entry => pick(entry, ['name', 'startTime'])),
+            resources: performance.getEntriesByType('resource').map(entry => pick(entry, [
+                'name', 'initiatorType', 'startTime', 'duration', 'transferSize', 'encodedBodySize',
+                'nextHopProtocol'])),
+        };
+    }
+"""
+
+
+def parse_profile(value):
+    """argparse type for --profile: 'trace,timing', 'all'... -> tuple of kinds"""
+    import argparse
+
+    kinds = [kind.strip() for kind in value.split(',') if kind.strip()]
+    if kinds == ["all"]:
+        return PROFILE_KINDS
+    unknown = [kind for kind in kinds if kind not in PROFILE_KINDS]
+    if unknown or not kinds:
+        raise argparse.ArgumentTypeError(
+            f"invalid profile {value!r}: use {', '.join(PROFILE_KINDS)} (comma separated) or all")
+    return tuple(kinds)
+
+
+def performance_summary(page):
+    """Navigation, paint and resource timing entries of a loaded page (ms, from navigation start)"""
+    performance = page.evaluate(PERFORMANCE_TIMING_SCRIPT)
+    resources = performance["resources"]
+    by_type = {}
+    for resource in resources:
+        totals = by_type.setdefault(resource["initiatorType"] or "other", {"count": 0, "transfer_size": 0})
+        totals["count"] += 1
+        totals["transfer_size"] += resource.get("transferSize") or 0
+    performance["summary"] = {
+        "resources": len(resources),
+        "transfer_size": sum(totals["transfer_size"] for totals in by_type.values()),
+        "by_type": by_type,
+        "slowest": sorted(resources, key=lambda resource: resource["duration"] or 0, reverse=True)[:5],
+    }
+    return performance
+
+
+def stop_trace(context, path, sink):
+    """Stops the tracing of a browser context and stores the trace zip through the sink"""
+    import os
+    import tempfile
+
+    handle, temporary = tempfile.mkstemp(suffix=".zip")
+    os.close(handle)
+    try:
+        context.tracing.stop(path=temporary)
+        with open(temporary, 'rb') as f:
+            return sink.write(path, f.read())
+    finally:
+        os.unlink(temporary)
+
+
+class TaskProfiler:
+    """
+    cProfile over every capture task of a run.
+
+    Before Python 3.12 cProfile only sees the thread that enables it, so each
+    task runs under its own profiler (whatever worker thread picks it up) and
+    the stats are merged at the end. From 3.12 a second profiler can't be
+    enabled while one is active: start() turns on a single one for the whole
+    run instead, and the run must capture one task at a time (the stats of
+    interleaved threads would be mixed up). That profiler sees the whole
+    process: the scheduler, filmstrip encoder, thumbnail pool and metrics
+    server threads are in the stats too, which dump() says in its header.
+    """
+
+    def __init__(self):
+        self._profiles = []
+        self._lock = threading.Lock()
+        self._run_profiler = None
+
+    def start(self):
+        """Enables the run-wide profiler on Python 3.12+. Raises ValueError if another profiler is active"""
+        import cProfile
+
+        if PER_THREAD_PROFILERS:
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        self._run_profiler = profiler
+
+    def stop(self):
+        if self._run_profiler is not None:
+            self._run_profiler.disable()
+            self._profiles.append(self._run_profiler)
+            self._run_profiler = None
+
+    def wrap(self, worker):
+        import cProfile
+
+        if not PER_THREAD_PROFILERS:
+            return worker
+
+        def profiled(task):
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                return worker(task)
+            finally:
+                profiler.disable()
+                with self._lock:
+                    self._profiles.append(profiler)
+        return profiled
+
+    def dump(self, path, sink, log=print, top=15):
+        """Writes the merged stats (pstats format) and prints the top functions by cumulative time"""
+        import io
+        import marshal
+        import pstats
+
+        if not self._profiles:
+            return None
+        stats = pstats.Stats(self._profiles[0], stream=io.StringIO())
+        for profile in self._profiles[1:]:
+            stats.add(profile)
+        # Same bytes as Stats.dump_stats(), but through the sink
+        location = sink.write(path, marshal.dumps(stats.stats))
+
+        if PER_THREAD_PROFILERS:
+            log("🔬 Python profile of the capture tasks (every worker thread merged)")
+        else:
+            log("🔬 Python profile of the whole process (Python 3.12+): besides the capture tasks it includes the "
+                "scheduler, filmstrip encoder, thumbnail and metrics server threads")
+        report = io.StringIO()
+        stats.stream = report
+        stats.sort_stats("cumulative").print_stats(top)
+        log(report.getvalue().rstrip())
+        return location
@@ -0,0 +1,279 @@
+"""
+Capture scheduler: parallel captures that stay polite with each host
+
+  • HostLimiter caps simultaneous page loads and requests per second per host,
+    and blocks a host after a 429/503 (honouring Retry-After, else exponential
+    backoff with jitter).
+  • AdaptiveConcurrency is an AIMD limit on parallel captures: it grows while
+    load latency stays close to each host's usual latency and shrinks
+    when pages slow down or hosts start throttling.
+  • CaptureScheduler runs the URL × device tasks in worker threads (each one
+    with its own sync Playwright instance) under both limits, retries
+    rate-limited tasks and gives transient failures (timeouts, dropped
+    connections) a bounded number of jittered retries.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Statuses meaning "slow down", retried instead of counted as failures
+RETRYABLE_STATUSES = (429, 503)
+# Latency baseline of a host: a low percentile of its last loads, so one
+# unusually fast load doesn't make every later one look like a slowdown
+BASELINE_WINDOW = 20
+BASELINE_PERCENTILE = 0.2
+# Loads of a host seen before its latency is judged at all
+BASELINE_MIN_SAMPLES = 5
+
+
+def parse_retry_after(value, default=None):
+    """Parses a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from datetime import datetime, timezone
+        from email.utils import parsedate_to_datetime
+
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError, IndexError):
+        return default
+
+
+def host_of(url):
+    """Host used to group rate limits (www. and port included, as servers see them)"""
+    return urlparse(url).netloc.lower()
+
+
+class HostLimiter:
+    """Per-host concurrency, request rate and backoff, shared by all worker threads"""
+
+    def __init__(self, max_per_host=4, requests_per_second=0.0, base_backoff=2.0, max_backoff=120.0):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._condition = threading.Condition()
+        self._hosts = {}
+
+    def _state(self, host):
+        return self._hosts.setdefault(host, {"active": 0, "next_start": 0.0, "blocked_until": 0.0, "failures": 0})
+
+    def acquire(self, host):
+        """Waits until the host accepts one more page load"""
+        with self._condition:
+            while True:
+                state = self._state(host)
+                now = time.monotonic()
+                wait = max(state["next_start"], state["blocked_until"]) - now
+                if wait <= 0 and state["active"] < self.max_per_host:
+                    state["active"] += 1
+                    state["next_start"] = now + self.min_interval
+                    return
+                self._condition.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, host):
+        with self._condition:
+            self._state(host)["active"] -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, host):
+        self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def backoff(self, host, retry_after=None):
+        """Blocks a host that answered 429/503. Returns the delay applied"""
+        with self._condition:
+            state = self._state(host)
+            state["failures"] += 1
+            if retry_after is None:
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (state["failures"] - 1))
+                # Jitter so workers don't all come back at the same instant
+                delay *= random.uniform(0.8, 1.2)
+            else:
+                delay = min(self.max_backoff, retry_after)
+            state["blocked_until"] = max(state["blocked_until"], time.monotonic() + delay)
+            self._condition.notify_all()
+            return delay
+
+    def success(self, host):
+        with self._condition:
+            self._state(host)["failures"] = 0
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on parallel captures.
+
+    Latency is compared per host with a baseline of that host (a low
+    percentile of its recent loads), so a fleet mixing fast and slow sites
+    doesn't look "overloaded" because of the slow ones. Each round of successes below `tolerance` × baseline adds one
+    slot; a slowdown removes a quarter of them and throttling halves them.
+    """
+
+    def __init__(self, max_limit, min_limit=1, initial=None, tolerance=2.0, enabled=True):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.enabled = enabled
+        if not enabled:
+            initial = self.max_limit
+        self.limit = float(initial or max(self.min_limit, min(self.max_limit, 2)))
+        self.tolerance = tolerance
+        self.active = 0
+        self._baselines = {}
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.active >= int(self.limit):
+                self._condition.wait()
+            self.active += 1
+
+    def release(self, host=None, latency=None, overloaded=False):
+        with self._condition:
+            self.active -= 1
+            if self.enabled:
+                if overloaded:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._successes = 0
+                elif latency is not None and host is not None:
+                    baseline = self.baseline(host, latency)
+                    if baseline is not None and latency > baseline * self.tolerance:
+                        self.limit = max(self.min_limit, self.limit * 0.75)
+                        self._successes = 0
+                    else:
+                        self._successes += 1
+                        if self._successes >= int(self.limit):
+                            self.limit = min(self.max_limit, self.limit + 1)
+                            self._successes = 0
+            self._condition.notify_all()
+
+    def baseline(self, host, latency):
+        """
+        Baseline of a host before this latency (None until BASELINE_MIN_SAMPLES
+        loads were seen), then records it. Call with the condition held
+        """
+        recent = self._baselines.setdefault(host, deque(maxlen=BASELINE_WINDOW))
+        ordered = sorted(recent)
+        recent.append(latency)
+        if len(ordered) < BASELINE_MIN_SAMPLES:
+            return None
+        return ordered[int(BASELINE_PERCENTILE * len(ordered))]
+
+
+class CaptureScheduler:
+    """
+    Runs tasks in worker threads under host and global limits.
+
+    worker(task) must return a result dict; a 'rate-limited' status (with an
+    optional 'retry_after' in seconds) puts the host in backoff and retries the
+    task up to `max_retries` times. A failed result marked 'retryable' is tried
+    again up to `failure_retries` times after retry_delay × 2^n seconds (±50%
+    jitter). The final result carries the number of 'attempts'; after a retry
+    its 'timings' add up every attempt, plus the 'backoff' spent between them,
+    and 'attempt_timings' keeps the timings of each attempt.
+    on_result(task, result) receives the final result of every task, from the
+    worker threads (one call at a time).
+    """
+
+    def __init__(self, concurrency=1, max_per_host=4, requests_per_second=0.0, max_retries=3,
+                 adaptive=True, log=print, failure_retries=1, retry_delay=2.0):
+        self.concurrency = max(1, concurrency)
+        self.hosts = HostLimiter(max_per_host, requests_per_second)
+        self.limit = AdaptiveConcurrency(self.concurrency, enabled=adaptive and self.concurrency > 1)
+        self.max_retries = max_retries
+        self.failure_retries = max(0, failure_retries)
+        self.retry_delay = retry_delay
+        self.log = log
+        self._result_lock = threading.Lock()
+
+    def _run_task(self, task, worker):
+        host = host_of(task["url"])
+        rate_limited = failures = 0
+        attempt_timings = []
+        # Time between the end of an attempt and the start of the next one
+        backoff = 0.0
+        attempt_end = None
+        while True:
+            self.limit.acquire()
+            result = None
+            try:
+                with self.hosts.slot(host):
+                    if attempt_end is not None:
+                        backoff += time.perf_counter() - attempt_end
+                    try:
+                        result = worker(task)
+                    except Exception as e:
+                        result = {"status": "failed", "error": str(e), "failure": "internal-error"}
+            finally:
+                attempt_end = time.perf_counter()
+                status = (result or {}).get("status")
+                latency = (result or {}).get("timings", {}).get("navigate")
+                self.limit.release(host, latency, overloaded=status == "rate-limited")
+            attempt_timings.append(dict(result.get("timings") or {}))
+
+            if status == "rate-limited" and rate_limited < self.max_retries:
+                rate_limited += 1
+                delay = self.hosts.backoff(host, result.get("retry_after"))
+                self.log(f"🐢 {host} is rate limiting (HTTP {result.get('http_status')}), "
+                         f"retrying {task.get('device', '')} in {delay:.1f}s...")
+                continue
+            if status == "failed" and result.get("retryable") and failures < self.failure_retries:
+                failures += 1
+                # Jitter spreads the retries of a batch that failed at the same moment
+                delay = self.retry_delay * 2 ** (failures - 1) * random.uniform(0.5, 1.5)
+                self.log(f"🔁 {task.get('device', '')} on {host} failed ({result.get('failure')}), "
+                         f"retry {failures}/{self.failure_retries} in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
+            if status == "ok":
+                self.hosts.success(host)
+            result["attempts"] = rate_limited + failures + 1
+            if len(attempt_timings) > 1:
+                timings = {}
+                for attempt in attempt_timings:
+                    for phase, seconds in attempt.items():
+                        timings[phase] = timings.get(phase, 0.0) + seconds
+                timings["backoff"] = backoff
+                result["timings"] = timings
+                result["attempt_timings"] = attempt_timings
+            return result
+
+    def run(self, tasks, worker, on_result=None):
+        """Processes an iterable of tasks (consumed lazily, so queues work too)"""
+        iterator = iter(tasks)
+        iterator_lock = threading.Lock()
+
+        def worker_loop():
+            while True:
+                with iterator_lock:
+                    task = next(iterator, None)
+                if task is None:
+                    return
+                result = self._run_task(task, worker)
+                if on_result is not None:
+                    with self._result_lock:
+                        on_result(task, result)
+
+        if self.concurrency == 1:
+            worker_loop()
+            return
+
+        threads = [threading.Thread(target=worker_loop, name=f"wshot-worker-{n}", daemon=True)
+                   for n in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
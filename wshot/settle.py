@@ -0,0 +1,139 @@
+"""
+Adaptive wait: per-host settle times learned from previous runs
+
+A single --wait-time is set for the slowest site and every other site pays for
+it on every device. With the catalog on, each capture records how long its
+page kept changing after navigation (last layout shift, largest contentful
+paint or asset load) and `--wait-time auto` waits the p95 of that host's
+recent history instead:
+
+    wshot --url-list urls.txt -all --wait-time auto       # capped at 10s
+    wshot --url-list urls.txt -all --wait-time auto:6     # capped at 6s
+
+Old samples weigh less (half-life of a week), so a redesigned site adapts
+within a few runs. Hosts without history wait the default 3 seconds.
+"""
+
+DEFAULT_WAIT_TIME = 3.0
+AUTO_WAIT_CAP = 10.0
+AUTO_WAIT_FLOOR = 0.25
+AUTO_WAIT_PERCENTILE = 0.95
+HALF_LIFE_DAYS = 7.0
+# Samples of a host used for its budget (the catalog keeps a few more)
+HISTORY_SIZE = 50
+# A page that changed this close to the end of the wait was still busy: its sample is a lower bound
+QUIET_WINDOW = 0.3
+# ...and counts as this much longer, so the budget grows until the page is seen settling
+CENSORED_GROWTH = 1.5
+
+# Last layout shift, largest contentful paint and painted asset of the page (ms since navigation start)
+SETTLE_SCRIPT = """
+    () => new Promise(resolve => {
+        const last = {shift: 0, paint: 0};
+        const observers = [['layout-shift', 'shift'], ['largest-contentful-paint', 'paint']].map(([type, key]) => {
+            try {
+                const observer = new PerformanceObserver(list => {
+                    for (const entry of list.getEntries()) {
+                        if (!entry.hadRecentInput) last[key] = Math.max(last[key], entry.startTime);
+                    }
+                });
+                observer.observe({type, buffered: true});
+                return observer;
+            } catch (e) {
+                return null;
+            }
+        });
+        // Buffered entries are delivered in a later task
+        setTimeout(() => {
+            observers.forEach(observer => observer && observer.disconnect());
+            // Only assets that change what is painted: fetch/XHR/beacons of chatty sites never stop
+            const painted = ['img', 'image', 'css', 'link', 'script', 'iframe', 'video'];
+            last.assets = performance.getEntriesByType('resource')
+                .filter(entry => painted.includes(entry.initiatorType))
+                .reduce((latest, entry) => Math.max(latest, entry.responseEnd), 0);
+            last.now = performance.now();
+            resolve(last);
+        }, 20);
+    })
+"""
+
+
+class AutoWait:
+    """--wait-time auto[:MAX]: wait each host's learned settle time, up to cap seconds"""
+
+    def __init__(self, cap=AUTO_WAIT_CAP):
+        self.cap = cap
+
+    def __str__(self):
+        return f"auto (up to {self.cap:g}s)"
+
+
+def parse_wait_time(value):
+    """argparse type for --wait-time: seconds, 'auto' or 'auto:MAX'"""
+    import argparse
+
+    name, _, cap = value.partition(':')
+    try:
+        if name == "auto":
+            wait = AutoWait(float(cap) if cap else AUTO_WAIT_CAP)
+            if wait.cap <= 0:
+                raise ValueError
+            return wait
+        seconds = float(value)
+        if seconds < 0:
+            raise ValueError
+        return seconds
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid wait time {value!r}: use seconds, auto or auto:MAX")
+
+
+def page_clock(page):
+    """Milliseconds since the page's navigation started (mark taken right after loading)"""
+    return page.evaluate("performance.now()")
+
+
+def measure_settle(page, loaded_at):
+    """
+    How long the page kept changing after loaded_at (page_clock() ms).
+
+    Returns {'seconds', 'censored'}: censored means the page was still
+    changing at the end of the wait, so the real settle time is longer
+    """
+    last = page.evaluate(SETTLE_SCRIPT)
+    last_change = max(last["shift"], last["paint"], last["assets"])
+    return {
+        "seconds": round(max(0.0, last_change - loaded_at) / 1000, 3),
+        "censored": last["now"] - last_change < QUIET_WINDOW * 1000,
+    }
+
+
+def settle_budget(samples, cap=AUTO_WAIT_CAP, now=None):
+    """
+    Wait time for a host from its history: the decayed p95 of its samples,
+    between AUTO_WAIT_FLOOR and cap. None without samples.
+
+    samples: [(seconds, censored, recorded_at ISO string)], any order
+    """
+    from datetime import datetime
+
+    if not samples:
+        return None
+    now = now or datetime.now()
+    weighted = []
+    for seconds, censored, recorded_at in samples:
+        if censored:
+            seconds = max(seconds, AUTO_WAIT_FLOOR) * CENSORED_GROWTH
+        try:
+            age_days = max(0.0, (now - datetime.fromisoformat(recorded_at)).total_seconds() / 86400)
+        except (TypeError, ValueError):
+            age_days = 0.0
+        weighted.append((seconds, 0.5 ** (age_days / HALF_LIFE_DAYS)))
+
+    weighted.sort()
+    threshold = AUTO_WAIT_PERCENTILE * sum(weight for _, weight in weighted)
+    cumulative = 0.0
+    for seconds, weight in weighted:
+        cumulative += weight
+        if cumulative >= threshold:
+            break
+    return round(min(cap, max(AUTO_WAIT_FLOOR, seconds)), 2)
@@ -0,0 +1,439 @@
+"""
+Work distribution for large URL sets
+
+Splits the URL × device task list between several machines without a central
+service. Two strategies are available:
+
+  • Static sharding (--shard INDEX/COUNT): every node computes the same task
+    list and keeps only the tasks whose stable hash falls in its slice.
+  • Directory queue (--queue DIR): nodes share a directory (NFS, SMB...) and
+    claim tasks one by one with lease files, so faster machines take more work.
+
+Each node writes a run manifest; `wshot merge` combines them into one report.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+# Seconds a count of the pending queue tasks is reused (metrics scrapes)
+PENDING_COUNT_TTL = 60
+
+
+def parse_shard(value):
+    """Parses an INDEX/COUNT shard spec (1-based index), used as argparse type"""
+    import argparse
+
+    try:
+        index_text, count_text = value.split('/')
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard '{value}' (expected INDEX/COUNT, ex: 2/4)")
+
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"invalid shard '{value}' (INDEX must be between 1 and COUNT)")
+    return index, count
+
+
+def stable_hash(text):
+    """Returns an integer hash that is identical on every machine and Python run"""
+    # hash() is salted per process, so it cannot be used to split work between hosts
+    return int(hashlib.sha256(text.encode('utf-8')).hexdigest()[:16], 16)
+
+
+def task_id(url, device_key):
+    """Deterministic identifier of a URL × device task"""
+    return hashlib.sha1(f"{url}\n{device_key}".encode('utf-8')).hexdigest()[:16]
+
+
+def build_task_list(urls, devices):
+    """Builds the complete URL × device task list, in input order"""
+    tasks = []
+    for url in urls:
+        for position, device_key in enumerate(devices):
+            tasks.append({
+                "id": task_id(url, device_key),
+                "url": url,
+                "device": device_key,
+                # OpenGraph is extracted once per URL, by whoever runs its first device
+                "opengraph": position == 0,
+            })
+    return tasks
+
+
+def select_shard(tasks, index, count):
+    """Keeps only the tasks that belong to shard INDEX of COUNT (1-based)"""
+    return [task for task in tasks if stable_hash(task["id"]) % count == index - 1]
+
+
+def read_url_list(path):
+    """Reads URLs from a file (one per line, '#' comments allowed). '-' reads stdin"""
+    import sys
+
+    if path == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        lines = Path(path).expanduser().read_text(encoding='utf-8').splitlines()
+
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#') and line not in urls:
+            urls.append(line)
+    return urls
+
+
+class WorkQueue:
+    """
+    Directory-based work queue shared by several hosts.
+
+    Layout inside the queue directory:
+        tasks/<id>.json    task description (written by every worker, identical content)
+        leases/<id>.lease  claim held by one worker, renewed while it works
+        done/<id>.json     task result; once present the task is never claimed again
+
+    Claims rely on O_CREAT|O_EXCL, which is atomic on local filesystems and on
+    NFSv3+. A lease older than `lease_seconds` is considered abandoned (crashed
+    worker) and can be taken over. While a worker holds tasks, a heartbeat
+    thread renews their leases every lease_seconds / 3, however long the
+    capture, its retries and backoffs take; close() stops it.
+    """
+
+    def __init__(self, root, lease_seconds=600, poll_interval=5.0):
+        self.root = Path(root).expanduser()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.tasks_dir = self.root / "tasks"
+        self.leases_dir = self.root / "leases"
+        self.done_dir = self.root / "done"
+        for folder in (self.tasks_dir, self.leases_dir, self.done_dir):
+            folder.mkdir(parents=True, exist_ok=True)
+        # Local list of task ids still to try (None until the first claim)
+        self._pending = None
+        self._claimed_since_listing = False
+        # Task files that can't be parsed are left out, like before they were listed
+        self._unreadable = set()
+        # Ids leased by this worker and not completed or released yet
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._heartbeat = None
+        self._stopped = threading.Event()
+        # (monotonic time, count) of the last listing, for pending_count()
+        self._pending_count = None
+
+    def seed(self, tasks):
+        """Registers tasks in the queue. Safe to call from every worker at once"""
+        added = 0
+        for task in tasks:
+            task_path = self.tasks_dir / f"{task['id']}.json"
+            if task_path.exists():
+                continue
+            # Write then rename so other workers never read a half-written file
+            tmp_path = self.tasks_dir / f".{task['id']}.{os.getpid()}.tmp"
+            tmp_path.write_text(json.dumps(task), encoding='utf-8')
+            os.replace(tmp_path, task_path)
+            added += 1
+        return added
+
+    def _lease_path(self, identifier):
+        return self.leases_dir / f"{identifier}.lease"
+
+    def _is_done(self, identifier):
+        return (self.done_dir / f"{identifier}.json").exists()
+
+    def _try_lease(self, identifier):
+        """Tries to take the lease of a task. Returns True if this worker owns it"""
+        lease_path = self._lease_path(identifier)
+        try:
+            fd = os.open(str(lease_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = time.time() - lease_path.stat().st_mtime
+            except FileNotFoundError:
+                return False  # Released in the meantime, retried on the next pass
+            if age < self.lease_seconds:
+                return False
+            # Abandoned lease: move it aside atomically, only one worker wins the rename
+            stale_path = self.leases_dir / f"{identifier}.stale.{self.worker.replace(':', '-')}"
+            try:
+                os.rename(lease_path, stale_path)
+                stale_path.unlink()
+            except OSError:
+                return False
+            return self._try_lease(identifier)
+
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"worker": self.worker, "claimed_at": datetime.now().isoformat()}, f)
+        return True
+
+    def renew(self, task):
+        """Extends the lease of a task that is still being processed"""
+        try:
+            os.utime(self._lease_path(task["id"]))
+        except FileNotFoundError:
+            pass
+
+    def _hold(self, identifier):
+        with self._held_lock:
+            self._held.add(identifier)
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._renew_held, name="wshot-queue-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def _drop(self, identifier):
+        with self._held_lock:
+            self._held.discard(identifier)
+
+    def _renew_held(self):
+        """Heartbeat: renews the leases of the tasks held by this worker until close()"""
+        while not self._stopped.wait(self.lease_seconds / 3):
+            with self._held_lock:
+                held = list(self._held)
+            for identifier in held:
+                try:
+                    self.renew({"id": identifier})
+                except OSError:
+                    pass  # Shared storage hiccup, retried on the next beat
+
+    def close(self):
+        """Stops the lease heartbeat"""
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+
+    def complete(self, task, result):
+        """Stores the task result and releases its lease"""
+        done_path = self.done_dir / f"{task['id']}.json"
+        tmp_path = self.done_dir / f".{task['id']}.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps(dict(result, worker=self.worker)), encoding='utf-8')
+        os.replace(tmp_path, done_path)
+        self.release(task)
+        cached = self._pending_count
+        if cached is not None:
+            self._pending_count = (cached[0], max(0, cached[1] - 1))
+
+    def release(self, task):
+        """Gives a task back to the queue without completing it"""
+        self._drop(task["id"])
+        try:
+            self._lease_path(task["id"]).unlink()
+        except FileNotFoundError:
+            pass
+
+    def pending_count(self):
+        """
+        Tasks of the whole queue without a result yet (leased ones included).
+
+        The directories are only listed when the last count is older than
+        PENDING_COUNT_TTL seconds; in between it comes from the claim
+        listings and this worker's own completions
+        """
+        cached = self._pending_count
+        if cached is None or time.monotonic() - cached[0] > PENDING_COUNT_TTL:
+            self._list_pending()
+            cached = self._pending_count
+        return cached[1]
+
+    def _list_pending(self):
+        """Ids of the tasks without a result, from one listing of tasks/ and done/"""
+        done = {name for name in os.listdir(self.done_dir) if name.endswith(".json")}
+        identifiers = [name[:-5] for name in os.listdir(self.tasks_dir)
+                       if name.endswith(".json") and not name.startswith(".") and name not in done]
+        self._pending_count = (time.monotonic(), len(identifiers))
+        return identifiers
+
+    def _pending_ids(self):
+        """Pending ids this worker can try, in its own order"""
+        identifiers = sorted(identifier for identifier in self._list_pending() if identifier not in self._unreadable)
+        # Start at a worker-specific offset so hosts don't all fight for the same task
+        offset = stable_hash(self.worker) % len(identifiers) if identifiers else 0
+        return deque(identifiers[offset:] + identifiers[:offset])
+
+    def _read_task(self, identifier):
+        try:
+            return json.loads((self.tasks_dir / f"{identifier}.json").read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def claim(self):
+        """
+        Claims the next available task.
+
+        The ids still to do are listed once and kept locally; only the
+        candidate being claimed is checked on disk (result, lease, task file).
+        The list is read again when it runs dry, to pick up tasks other
+        workers released or abandoned. Blocks while the only remaining tasks
+        are leased by other workers (they may crash and release them), and
+        returns None once everything is done.
+        """
+        while True:
+            if not self._pending:
+                if self._pending is not None and not self._claimed_since_listing:
+                    # A whole pass found nothing to take: wait for other workers
+                    time.sleep(self.poll_interval)
+                self._pending = self._pending_ids()
+                self._claimed_since_listing = False
+                if not self._pending:
+                    return None
+
+            identifier = self._pending.popleft()
+            if self._is_done(identifier) or not self._try_lease(identifier):
+                continue
+            # Finished by another worker between the check and the lease
+            task = None if self._is_done(identifier) else self._read_task(identifier)
+            if task is None:
+                if not self._is_done(identifier):
+                    self._unreadable.add(identifier)
+                self.release({"id": identifier})
+                continue
+            self._claimed_since_listing = True
+            self._hold(identifier)
+            return task
+
+    def __iter__(self):
+        while True:
+            task = self.claim()
+            if task is None:
+                return
+            yield task
+
+
+def new_manifest(run_id, shard=None, total_tasks=0):
+    """Creates an empty run manifest"""
+    return {
+        "version": MANIFEST_VERSION,
+        "run_id": run_id,
+        "host": socket.gethostname(),
+        "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+        "total_tasks": total_tasks,
+        "started_at": datetime.now().isoformat(),
+        "finished_at": None,
+        "tasks": [],
+        "opengraph": [],
+        "assets": [],
+    }
+
+
+def summarize_tasks(tasks):
+    """Task counts by status and by failure category (dns, navigate-timeout...)"""
+    statuses, failures = {}, {}
+    for task in tasks:
+        status = task.get("status", "unknown")
+        statuses[status] = statuses.get(status, 0) + 1
+        if status != "ok" and task.get("failure"):
+            failures[task["failure"]] = failures.get(task["failure"], 0) + 1
+    return {"tasks_reported": len(tasks), "by_status": statuses, "by_failure": failures}
+
+
+def manifest_filename(run_id, shard=None):
+    """Builds the manifest filename of a run (one file per shard)"""
+    if shard:
+        return f"manifest-{run_id}-shard-{shard[0]}of{shard[1]}.json"
+    return f"manifest-{run_id}.json"
+
+
+def encode_manifest(manifest):
+    """Manifest as UTF-8 JSON bytes (to embed it in an archive)"""
+    return json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def write_manifest(manifest, path):
+    """Writes a manifest to disk atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(encode_manifest(manifest))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _collect_manifest_paths(inputs):
+    paths = []
+    for item in inputs:
+        item = Path(item).expanduser()
+        if item.is_dir():
+            # Skip previous merge results so merging a folder twice is idempotent
+            paths.extend(path for path in sorted(item.glob("manifest-*.json"))
+                         if not path.name.endswith("-merged.json"))
+        else:
+            paths.append(item)
+    return paths
+
+
+def merge_manifests(inputs):
+    """
+    Combines per-shard manifests into a single report.
+
+    `inputs` may contain manifest files or folders holding them. Tasks are
+    deduplicated by id; a successful result always wins over a failed one.
+    """
+    merged = None
+    tasks_by_id = {}
+    opengraph_by_url = {}
+    assets_by_url = {}
+    shards_seen = set()
+    shard_count = None
+
+    for manifest_path in _collect_manifest_paths(inputs):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        if merged is None:
+            merged = {
+                "version": MANIFEST_VERSION,
+                "run_id": manifest.get("run_id"),
+                "hosts": [],
+                "sources": [],
+                "total_tasks": manifest.get("total_tasks", 0),
+                "started_at": manifest.get("started_at"),
+                "finished_at": manifest.get("finished_at"),
+            }
+
+        merged["sources"].append(str(manifest_path))
+        if manifest.get("host") and manifest["host"] not in merged["hosts"]:
+            merged["hosts"].append(manifest["host"])
+        merged["total_tasks"] = max(merged["total_tasks"], manifest.get("total_tasks", 0))
+        if manifest.get("started_at") and (not merged["started_at"] or manifest["started_at"] < merged["started_at"]):
+            merged["started_at"] = manifest["started_at"]
+        if manifest.get("finished_at") and (not merged["finished_at"] or manifest["finished_at"] > merged["finished_at"]):
+            merged["finished_at"] = manifest["finished_at"]
+
+        if manifest.get("shard"):
+            index, count = (int(part) for part in manifest["shard"].split('/'))
+            shards_seen.add(index)
+            shard_count = count
+
+        for task in manifest.get("tasks", []):
+            previous = tasks_by_id.get(task["id"])
+            if previous is None or (previous.get("status") != "ok" and task.get("status") == "ok"):
+                tasks_by_id[task["id"]] = task
+
+        for entry in manifest.get("opengraph", []):
+            opengraph_by_url.setdefault(entry["url"], entry)
+
+        for entry in manifest.get("assets", []):
+            assets_by_url.setdefault(entry["url"], entry)
+
+    if merged is None:
+        raise ValueError("no manifests found to merge")
+
+    merged["tasks"] = list(tasks_by_id.values())
+    merged["opengraph"] = list(opengraph_by_url.values())
+    merged["assets"] = list(assets_by_url.values())
+
+    merged["summary"] = summarize_tasks(merged["tasks"])
+    if shard_count:
+        merged["summary"]["missing_shards"] = [
+            f"{index}/{shard_count}" for index in range(1, shard_count + 1) if index not in shards_seen
+        ]
+
+    return merged
@@ -0,0 +1,124 @@
+"""
+Perceptual hashes: near-duplicate detection across captures
+
+Two captures of a page that only differ by a rotating banner or a clock have
+different SHA-256 but almost the same difference hash (dHash): the image is
+shrunk to 9x8 grey pixels and each bit says whether a pixel is brighter than
+its right neighbour. The number of differing bits (Hamming distance) measures
+how much the page changed; up to ~6 of 64 bits is the same layout.
+
+Needs Pillow (numpy is used when installed): pip install Pillow numpy
+"""
+
+from .images import open_reduced, pillow_available
+
+# 8 rows of 8 comparisons = 64-bit hash, stored as 16 hex digits
+HASH_SIZE = 8
+# Captures within this many differing bits are considered the same page
+DEFAULT_MAX_DISTANCE = 6
+
+
+def phash_available():
+    """True when Pillow is installed (hashes are None otherwise)"""
+    return pillow_available()
+
+
+def _grey_thumbnail(data):
+    """Decodes an image straight into the (HASH_SIZE + 1) x HASH_SIZE grey thumbnail"""
+    from PIL import Image
+
+    width, height = HASH_SIZE + 1, HASH_SIZE
+    # A 1920x15000 full page is ~40x35 pixels before any resampling
+    image = open_reduced(data, width * 4, height * 4)
+    return image.convert('L').resize((width, height), Image.BOX)
+
+
+def perceptual_hash(data):
+    """
+    64-bit dHash of an encoded image (PNG/JPEG bytes), as 16 hex digits.
+
+    Returns None when Pillow is missing or the data can't be decoded.
+    """
+    try:
+        thumbnail = _grey_thumbnail(data)
+    except Exception:
+        return None
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        pixels = np.asarray(thumbnail, dtype=np.int16)
+        bits = pixels[:, 1:] > pixels[:, :-1]
+        return np.packbits(bits.ravel()).tobytes().hex()
+
+    pixels = thumbnail.tobytes()
+    row = HASH_SIZE + 1
+    value = 0
+    for y in range(HASH_SIZE):
+        for x in range(HASH_SIZE):
+            value = (value << 1) | (pixels[y * row + x + 1] > pixels[y * row + x])
+    return f"{value:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def hamming_distance(first, second):
+    """Number of differing bits between two hex hashes"""
+    return bin(int(first, 16) ^ int(second, 16)).count('1')
+
+
+def _neighbours(hashes, index, max_distance, np=None):
+    """Indexes after `index` whose hash is within max_distance (numpy array, or list without numpy)"""
+    if np is None:
+        return [index + 1 + offset for offset, other in enumerate(hashes[index + 1:])
+                if bin(hashes[index] ^ other).count('1') <= max_distance]
+
+    differences = np.bitwise_xor(hashes[index + 1:], hashes[index])
+    distances = np.unpackbits(differences.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+    return (np.nonzero(distances <= max_distance)[0] + index + 1).tolist()
+
+
+def cluster_captures(captures, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    Groups catalog rows whose 'phash' are within max_distance of each other.
+
+    Only captures of the same device and capture type are compared (a mobile
+    viewport never matches a desktop full page). Returns the clusters with two
+    or more captures, largest first; rows without a hash are ignored.
+    """
+    groups = {}
+    for capture in captures:
+        if capture.get("phash"):
+            groups.setdefault((capture.get("device"), capture.get("capture_type")), []).append(capture)
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    clusters = []
+    for members in groups.values():
+        values = [int(capture["phash"], 16) for capture in members]
+        hashes = np.array(values, dtype=np.uint64) if np is not None else values
+
+        # Union-find over every pair within the distance
+        parent = list(range(len(members)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i in range(len(members) - 1):
+            for j in _neighbours(hashes, i, max_distance, np):
+                parent[find(j)] = find(i)
+
+        by_root = {}
+        for i, capture in enumerate(members):
+            by_root.setdefault(find(i), []).append(capture)
+        clusters += [cluster for cluster in by_root.values() if len(cluster) > 1]
+
+    clusters.sort(key=len, reverse=True)
+    return clusters
@@ -0,0 +1,268 @@
+"""
+Output sinks for captures and metadata
+
+Every file wshot produces (screenshots, OpenGraph JSON, og:image) goes through
+a sink. Paths are always computed with the usual layout
+(<output-dir>/<client>/<device>/<file>); each sink decides what to do with them:
+
+  • FilesystemSink: writes the file at that path (default)
+  • MemorySink: keeps the bytes in memory, nothing touches the disk
+  • CallbackSink: hands (name, bytes) to a function (upload, diff, thumbnail...)
+  • TarSink / ZipSink: streams every file into a single archive (or stdout)
+
+Non-filesystem sinks name entries relative to their `root` (the output dir),
+ex: example.com/mobile/example.com_main-page-mobile-20241005_142958.png
+"""
+
+import io
+import threading
+import time
+from pathlib import Path
+
+
+class OutputSink:
+    """Base sink. Subclasses implement _store(name, data) and may override close()"""
+
+    scheme = "sink"
+
+    def __init__(self, root=None):
+        self.root = Path(root).expanduser() if root else None
+        # Captures can run in several threads; archive writers are not thread-safe
+        self._lock = threading.Lock()
+
+    def name_for(self, path):
+        """Entry name of a path: relative to the sink root when possible"""
+        path = Path(path)
+        if self.root is not None:
+            try:
+                return path.relative_to(self.root).as_posix()
+            except ValueError:
+                pass
+        return path.as_posix().lstrip('/')
+
+    def makedirs(self, path):
+        """Creates a folder. Only meaningful for the filesystem sink"""
+
+    def write(self, path, data):
+        """Stores `data` (bytes-like) for `path` and returns where it went"""
+        name = self.name_for(path)
+        with self._lock:
+            self._store(name, data)
+        return f"{self.scheme}:{name}"
+
+    def write_stream(self, path, chunks):
+        """Stores data coming in chunks (ex: a download). Buffers by default"""
+        return self.write(path, b''.join(chunks))
+
+    def _store(self, name, data):
+        raise NotImplementedError
+
+    def close(self):
+        """Flushes and releases the sink"""
+
+    def __bool__(self):
+        # An empty MemorySink has len() 0: `sink or DEFAULT_SINK` must still pick it
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FilesystemSink(OutputSink):
+    """Writes every file to its path on disk (default behaviour)"""
+
+    scheme = "file"
+
+    def makedirs(self, path):
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+    def write(self, path, data):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return str(path)
+
+    def write_stream(self, path, chunks):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return str(path)
+
+
+class MemorySink(OutputSink):
+    """
+    Keeps every file in memory.
+
+    Entries are available as read-only memoryviews, so passing them to an
+    uploader or an image library does not copy the PNG again:
+        sink = MemorySink()
+        ...
+        for name, view in sink.items():
+            upload(name, view)
+    """
+
+    scheme = "memory"
+
+    def __init__(self, root=None):
+        super().__init__(root)
+        self.files = {}
+
+    def _store(self, name, data):
+        self.files[name] = bytes(data)
+
+    def get(self, name):
+        """Returns the memoryview of an entry (name or full location)"""
+        if name.startswith(f"{self.scheme}:"):
+            name = name[len(self.scheme) + 1:]
+        return memoryview(self.files[name])
+
+    def items(self):
+        return [(name, memoryview(data)) for name, data in self.files.items()]
+
+    def __len__(self):
+        return len(self.files)
+
+
+class CallbackSink(OutputSink):
+    """Passes every file to callback(name, data) as soon as it is produced"""
+
+    scheme = "callback"
+
+    def __init__(self, callback, root=None):
+        super().__init__(root)
+        self.callback = callback
+
+    def _store(self, name, data):
+        self.callback(name, data)
+
+
+class TarSink(OutputSink):
+    """
+    Streams every file into one tar archive, written sequentially.
+
+    `target` is a path or a writable binary file object (ex: sys.stdout.buffer).
+    Compression is taken from the extension (.tar, .tar.gz/.tgz, .tar.bz2,
+    .tar.xz, .tar.zst) or given explicitly ('', 'gz', 'bz2', 'xz', 'zst').
+    zstd needs the zstandard package: pip install zstandard
+    """
+
+    scheme = "tar"
+
+    def __init__(self, target, root=None, compression=None):
+        import tarfile
+
+        super().__init__(root)
+        if compression is None:
+            compression = _compression_from_name(str(target)) if isinstance(target, (str, Path)) else ''
+        self._compressor = None
+        if compression == 'zst':
+            # tarfile has no zstd before Python 3.14: compress the tar stream ourselves
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("zstd archives require zstandard: pip install zstandard")
+            if isinstance(target, (str, Path)):
+                self.location = str(target)
+                output, closefd = open(Path(target).expanduser(), 'wb'), True
+            else:
+                self.location = getattr(target, 'name', 'stream')
+                output, closefd = target, False
+            self._compressor = zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(output, closefd=closefd)
+            self._archive = tarfile.open(fileobj=self._compressor, mode="w|")
+            return
+        mode = f"w|{compression}"
+        if isinstance(target, (str, Path)):
+            self.location = str(target)
+            self._archive = tarfile.open(str(Path(target).expanduser()), mode)
+        else:
+            self.location = getattr(target, 'name', 'stream')
+            self._archive = tarfile.open(fileobj=target, mode=mode)
+
+    def _store(self, name, data):
+        import tarfile
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        with self._lock:
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
+            if self._compressor is not None:
+                self._compressor.close()
+                self._compressor = None
+
+
+class ZipSink(OutputSink):
+    """Streams every file into one zip archive (PNGs are stored, not re-compressed)"""
+
+    scheme = "zip"
+
+    def __init__(self, target, root=None):
+        import zipfile
+
+        super().__init__(root)
+        self.location = str(target) if isinstance(target, (str, Path)) else getattr(target, 'name', 'stream')
+        if isinstance(target, (str, Path)):
+            target = str(Path(target).expanduser())
+        self._archive = zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def _store(self, name, data):
+        import zipfile
+
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        # Images are already compressed: storing them is much faster and just as small
+        already_compressed = name.lower().endswith(('.png', '.jpg', '.jpeg', '.webp', '.gif', '.zst', '.gz'))
+        info.compress_type = zipfile.ZIP_STORED if already_compressed else zipfile.ZIP_DEFLATED
+        self._archive.writestr(info, bytes(data))
+
+    def close(self):
+        with self._lock:
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
+
+
+def _compression_from_name(name):
+    name = name.lower()
+    if name.endswith(('.tar.gz', '.tgz')):
+        return 'gz'
+    if name.endswith(('.tar.bz2', '.tbz2')):
+        return 'bz2'
+    if name.endswith(('.tar.xz', '.txz')):
+        return 'xz'
+    if name.endswith(('.tar.zst', '.tzst')):
+        return 'zst'
+    return ''
+
+
+def open_sink(target=None, root=None):
+    """
+    Builds a sink from a CLI-style target.
+
+    None -> FilesystemSink, '-' -> tar stream on stdout, '*.zip' -> ZipSink,
+    '*.tar[.gz|.bz2|.xz|.zst]' -> TarSink. With '-' nothing else may write to
+    stdout (the CLI sends its console output to stderr).
+    """
+    import sys
+
+    if target is None:
+        return FilesystemSink(root)
+    if target == '-':
+        return TarSink(sys.stdout.buffer, root=root)
+    if str(target).lower().endswith('.zip'):
+        return ZipSink(target, root=root)
+    return TarSink(target, root=root)
+
+
+# Shared default: most calls never pass a sink and just write files
+DEFAULT_SINK = FilesystemSink()